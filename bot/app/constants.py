@@ -84,6 +84,62 @@ class Messages:
         "❌ Ошибка: не найдена информация о враче.\nНачните поиск заново с /start"
     )
 
+    # AI search
+    AI_WELCOME = (
+        "🤖 <b>ИИ Ассистент активирован!</b>\n\n"
+        "Я помогу найти врача в Калуге. Напишите:\n"
+        "• Какой врач нужен (специальность)\n"
+        "• Где вы хотите его найти (адрес, район)\n\n"
+        "<b>Примеры запросов:</b>\n"
+        "• \"Нужен стоматолог в центре Калуги\"\n"
+        "• \"Ищу детского врача на улице Ленина\"\n"
+        "• \"Окулист в Московском районе\"\n\n"
+        "⚠️ <i>Я не могу давать медицинские советы или консультации.</i>\n"
+        "Для возврата в меню нажмите /start"
+    )
+
+    AI_CLARIFY_LOCATION = (
+        "Я вижу, что вы указали адрес, но не понял, какого врача вы ищете. 🤔\n\n"
+        "Пожалуйста, уточните специальность, например:\n"
+        "• \"Нужен стоматолог на улице Ленина\"\n"
+        "• \"Ищу терапевта в центре\""
+    )
+
+    AI_NOT_DOCTOR_RELATED = (
+        "Братан, я тут только врачей ищу, а не на все вопросы отвечаю 😅\n\n"
+        "Скажи нормально:\n"
+        "• Какой врач нужен (терапевт, стоматолог, окулист)\n"
+        "• Где искать (можно указать район или улицу)\n\n"
+        "Или жми /start чтобы вернуться в меню."
+    )
+
+    AI_HOSPITALS_FILTERED = (
+        "✅ <b>Отфильтровал результаты по вашему запросу!</b>\n\n"
+        "🏥 <b>Найдено больниц: {count}</b> (из {total})\n"
+        "Специальность: <b>{specialty}</b>{location_hint}\n\n"
+        "Выберите медицинское учреждение:"
+    )
+
+    AI_HOSPITALS_REFINED = (
+        "✅ <b>Отфильтровал результаты по вашему запросу!</b>\n\n"
+        "🏥 <b>Найдено больниц: {count}</b>\n"
+        "Специальность: <b>{specialty}</b>{location_hint}\n\n"
+        "Выберите медицинское учреждение:"
+    )
+
+    AI_HOSPITALS_RESTORED = (
+        "✅ <b>Отфильтрованные результаты</b>\n\n"
+        "🏥 <b>Найдено больниц: {count}</b> (из {total})\n"
+        "Специальность: <b>{specialty}</b>{location_hint}\n\n"
+        "Выберите медицинское учреждение:"
+    )
+
+    AI_HOSPITALS_UNFILTERED = (
+        "🏥 <b>Выберите медицинское учреждение:</b>\n\n"
+        "Специальность: <b>{specialty}</b>\n"
+        "Найдено: <b>{count}</b> больниц{location_hint}"
+    )
+
     # Errors
     ERROR_LOADING_DATA = "Ошибка при загрузке данных"
     ERROR_SAVING_REVIEW = (
@@ -3,29 +3,151 @@
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
+import asyncio
 import logging
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from app.services.ai_assistant import AIAssistant
+from app.services.standalone_service import StandaloneDataService
 from app.keyboards.inline import build_paginated_keyboard, build_start_keyboard
 from app.states.search import SearchStates
 from app.constants import Messages
+from app.utils import TTLCache, parse_cb, safe_delete
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+# Specialties and hospitals change rarely, keep them for a few minutes
+SPECIALTIES_CACHE_TTL = 300
+HOSPITALS_CACHE_TTL = 300
 
-async def get_data_service(message_or_callback):
-    """Get data service from bot context."""
-    if hasattr(message_or_callback.bot, '_data_service'):
-        return message_or_callback.bot._data_service
-    return None
+# Number of conversation messages kept in FSM state
+MAX_HISTORY_LENGTH = 10
 
+# Conversation history is stored compactly as (role, content) tuples
+ROLE_USER = 0
+ROLE_ASSISTANT = 1
+_ROLE_NAMES = ('user', 'assistant')
 
-async def get_ai_assistant(message_or_callback):
-    """Get AI assistant from bot context."""
-    if hasattr(message_or_callback.bot, '_ai_assistant'):
-        return message_or_callback.bot._ai_assistant
-    return None
+
+@lru_cache(maxsize=64)
+def _format_district(district: str) -> str:
+    """Format district name as a location hint line."""
+    return f"\n📍 Район: {district.title()}"
+
+
+def _clean_query(text: Optional[str]) -> str:
+    """Strip surrounding whitespace, reusing the string when it is already clean."""
+    if text and (text[0].isspace() or text[-1].isspace()):
+        return text.strip()
+    return text or ""
+
+
+def _expand_history(conversation_history: list) -> list:
+    """Convert compact (role, content) history into AI assistant messages."""
+    return [
+        {'role': _ROLE_NAMES[role], 'content': content}
+        for role, content in conversation_history
+    ]
+
+
+def _get_bot_cache(bot, attr: str) -> TTLCache:
+    """Get TTL cache stored on the bot instance, creating it on first use."""
+    cache = getattr(bot, attr, None)
+    if cache is None:
+        cache = TTLCache()
+        setattr(bot, attr, cache)
+    return cache
+
+
+async def cached_get_specialties(data_service, bot, ttl: float = SPECIALTIES_CACHE_TTL) -> list:
+    """Get specialties list, reusing a recent result cached on the bot.
+
+    Args:
+        data_service: Data service instance
+        bot: Bot instance holding the cache
+        ttl: Cache time-to-live in seconds
+
+    Returns:
+        List of specialties
+    """
+    cache = _get_bot_cache(bot, '_specialties_cache')
+    specialties_data = await cache.get_or_load(
+        (100,), lambda: data_service.get_specialties(limit=100), ttl=ttl
+    )
+    return specialties_data.get('items', [])
+
+
+async def cached_get_hospitals_index(
+    bot, data_service, specialty_id: int, ttl: float = HOSPITALS_CACHE_TTL
+) -> Tuple[list, dict]:
+    """Get hospitals for specialty together with an ID index.
+
+    Both the list and the ``{id: hospital}`` index are cached on the bot.
+
+    Args:
+        bot: Bot instance holding the cache
+        data_service: Data service instance
+        specialty_id: Specialty ID
+        ttl: Cache time-to-live in seconds
+
+    Returns:
+        Tuple of (hospitals list, hospitals by ID)
+    """
+    async def load():
+        hospitals_data = await data_service.get_hospitals(
+            specialty_id=specialty_id, limit=100
+        )
+        items = hospitals_data.get('items', [])
+        return items, {h['id']: h for h in items}
+
+    cache = _get_bot_cache(bot, '_hospitals_cache')
+    return await cache.get_or_load(specialty_id, load, ttl=ttl)
+
+
+async def cached_get_hospitals(
+    bot, data_service, specialty_id: int, ttl: float = HOSPITALS_CACHE_TTL
+) -> list:
+    """Get hospitals for specialty, reusing a recent result cached on the bot.
+
+    Args:
+        bot: Bot instance holding the cache
+        data_service: Data service instance
+        specialty_id: Specialty ID
+        ttl: Cache time-to-live in seconds
+
+    Returns:
+        List of hospitals
+    """
+    hospitals, _ = await cached_get_hospitals_index(bot, data_service, specialty_id, ttl)
+    return hospitals
+
+
+async def _render_hospitals(
+    message: Message, hospitals: list, hospital_ids: list, text: str
+) -> None:
+    """Send hospitals list with selection keyboard.
+
+    Args:
+        message: Message to answer to
+        hospitals: Hospitals to show
+        hospital_ids: IDs of the shown hospitals, precomputed by the caller
+        text: Message text
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Showing %d hospitals: %s", len(hospital_ids), hospital_ids)
+
+    keyboard = build_paginated_keyboard(
+        items=hospitals,
+        callback_prefix="ai_hospital",
+        page=1,
+        total_pages=1,
+        id_key="id",
+        name_key="name",
+    )
+
+    await message.answer(text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "ai_search")
@@ -34,62 +156,40 @@ async def start_ai_search(callback: CallbackQuery, state: FSMContext):
     await state.set_state(SearchStates.ai_searching)
     await state.update_data(conversation_history=[])
     
-    text = (
-        "🤖 <b>ИИ Ассистент активирован!</b>\n\n"
-        "Я помогу найти врача в Калуге. Напишите:\n"
-        "• Какой врач нужен (специальность)\n"
-        "• Где вы хотите его найти (адрес, район)\n\n"
-        "<b>Примеры запросов:</b>\n"
-        "• \"Нужен стоматолог в центре Калуги\"\n"
-        "• \"Ищу детского врача на улице Ленина\"\n"
-        "• \"Окулист в Московском районе\"\n\n"
-        "⚠️ <i>Я не могу давать медицинские советы или консультации.</i>\n"
-        "Для возврата в меню нажмите /start"
-    )
+    await safe_delete(callback.message)
     
-    try:
-        await callback.message.delete()
-    except Exception:
-        pass
-    
-    await callback.message.answer(text, parse_mode="HTML")
+    await callback.message.answer(Messages.AI_WELCOME)
     await callback.answer()
 
 
 @router.message(SearchStates.ai_searching)
-async def process_ai_query(message: Message, state: FSMContext):
+async def process_ai_query(
+    message: Message,
+    state: FSMContext,
+    data_service: StandaloneDataService,
+    ai_assistant: AIAssistant,
+):
     """Process user query with AI."""
-    logger.info(f"AI search query received: {message.text[:50]}...")
-    
-    user_query = message.text.strip()
+    user_query = _clean_query(message.text)
+    logger.info("AI search query received: %s...", user_query[:50])
     
     if not user_query:
         await message.answer("Пожалуйста, напишите ваш запрос текстом.")
         return
     
-    # Get services
-    data_service = await get_data_service(message)
-    ai_assistant = await get_ai_assistant(message)
-    
-    if not data_service or not ai_assistant:
-        await message.answer(
-            "Ошибка сервиса. Попробуйте обычный поиск.",
-            reply_markup=build_start_keyboard()
-        )
-        await state.clear()
-        return
-    
     # Show typing indicator
     await message.bot.send_chat_action(message.chat.id, "typing")
     
+    # State changes are buffered and written once when the handler finishes
+    pending = {}
+    
     try:
         # Get conversation history
         data = await state.get_data()
         conversation_history = data.get('conversation_history', [])
         
         # Get specialties
-        specialties_data = await data_service.get_specialties(limit=100)
-        specialties = specialties_data.get('items', [])
+        specialties = await cached_get_specialties(data_service, message.bot)
         
         if not specialties:
             await message.answer(
@@ -103,58 +203,55 @@ async def process_ai_query(message: Message, state: FSMContext):
         result = await ai_assistant.search_doctors(
             user_query=user_query,
             specialties=specialties,
-            conversation_history=conversation_history
+            conversation_history=_expand_history(conversation_history)
         )
+        response = result['response']
+        needs_clarification = result['needs_clarification']
+        specialty_id = result.get('specialty_id')
+        specialty_name = result.get('specialty_name')
+        location_info = result['location_info']
         
         # Update conversation history
-        conversation_history.append({'role': 'user', 'content': user_query})
-        conversation_history.append({'role': 'assistant', 'content': result['response']})
-        await state.update_data(conversation_history=conversation_history)
-        
-        # Send AI response
-        await message.answer(result['response'], parse_mode="HTML")
+        conversation_history = [
+            *conversation_history,
+            (ROLE_USER, user_query),
+            (ROLE_ASSISTANT, response),
+        ][-MAX_HISTORY_LENGTH:]
+        pending['conversation_history'] = conversation_history
         
         # Check if user only provided address without specialty
-        location_info = result.get('location_info', {})
-        if location_info.get('has_location') and result['needs_clarification']:
-            await message.answer(
-                "Я вижу, что вы указали адрес, но не понял, какого врача вы ищете. 🤔\n\n"
-                "Пожалуйста, уточните специальность, например:\n"
-                "• \"Нужен стоматолог на улице Ленина\"\n"
-                "• \"Ищу терапевта в центре\""
+        has_location = location_info.has_location
+        if has_location and needs_clarification:
+            # Both replies are independent, send them concurrently
+            await asyncio.gather(
+                message.answer(response),
+                message.answer(Messages.AI_CLARIFY_LOCATION),
             )
             return
         
+        # Send AI response
+        await message.answer(response)
+        
         # Check if AI couldn't find specialty (user asking unrelated questions)
-        if result['needs_clarification'] and not location_info.get('has_location'):
-            await message.answer(
-                "Братан, я тут только врачей ищу, а не на все вопросы отвечаю 😅\n\n"
-                "Скажи нормально:\n"
-                "• Какой врач нужен (терапевт, стоматолог, окулист)\n"
-                "• Где искать (можно указать район или улицу)\n\n"
-                "Или жми /start чтобы вернуться в меню."
-            )
+        if needs_clarification and not has_location:
+            await message.answer(Messages.AI_NOT_DOCTOR_RELATED)
             return
         
         # If specialty identified, show doctors
-        if result['specialty_id'] and not result['needs_clarification']:
-            specialty_id = result['specialty_id']
-            specialty_name = result['specialty_name']
-            location_info = result.get('location_info', {})
+        if specialty_id and not needs_clarification:
+            district = location_info.district
+            near_center = location_info.near_center
             
             # Save to state with AI search flag
-            await state.update_data(
+            pending.update(
                 specialty_id=specialty_id,
                 specialty_name=specialty_name,
-                location_info=location_info,
+                location_info=location_info.to_dict(),
                 using_ai_search=True  # Mark that we're using AI search
             )
             
             # Get hospitals
-            hospitals_data = await data_service.get_hospitals(
-                specialty_id=specialty_id, limit=100
-            )
-            hospitals = hospitals_data.get('items', [])
+            hospitals = await cached_get_hospitals(message.bot, data_service, specialty_id)
             
             if not hospitals:
                 await message.answer(
@@ -166,9 +263,9 @@ async def process_ai_query(message: Message, state: FSMContext):
             
             # Filter hospitals by location using AI if specified
             original_count = len(hospitals)
-            filtered_applied = False
+            filter_applied = False
             
-            if location_info.get('has_location'):
+            if has_location:
                 # Use AI to filter hospitals based on real addresses from DB
                 filtered_hospitals = await ai_assistant.filter_hospitals_by_location(
                     user_query=user_query,
@@ -178,88 +275,75 @@ async def process_ai_query(message: Message, state: FSMContext):
                 # Use filtered list if not empty and different from original
                 if filtered_hospitals and len(filtered_hospitals) < len(hospitals):
                     hospitals = filtered_hospitals
-                    filtered_applied = True
-                    logger.info(f"AI filtered hospitals by location: {len(hospitals)}/{original_count} results")
+                    filter_applied = True
+                    logger.info("AI filtered hospitals by location: %d/%d results", len(hospitals), original_count)
                 elif not filtered_hospitals:
-                    logger.warning(f"No hospitals matched location filter, showing all {original_count}")
+                    logger.warning("No hospitals matched location filter, showing all %d", original_count)
                     # Inform user that no exact matches found
                     await message.answer(
                         "⚠️ Не нашел больниц точно по указанному адресу.\n"
                         "Показываю все доступные варианты:"
                     )
                 else:
-                    logger.info(f"AI returned same hospitals, no filtering applied")
+                    logger.info("AI returned same hospitals, no filtering applied")
             
             # Save filtered hospitals list to state for back navigation
             hospital_ids = [h['id'] for h in hospitals]
-            logger.info(f"Saving {len(hospital_ids)} hospital IDs to state: {hospital_ids}")
-            await state.update_data(
-                filtered_hospitals=hospital_ids,
-                filter_applied=filtered_applied,
-                original_count=original_count
-            )
-            
-            # Show hospitals
-            keyboard = build_paginated_keyboard(
-                items=hospitals,
-                callback_prefix="ai_hospital",
-                page=1,
-                total_pages=1,
-                id_key="id",
-                name_key="name",
+            pending.update(
+                filtered_hospitals=tuple(hospital_ids),
+                filter_applied=filter_applied,
             )
             
             # Build message with location info
             location_hint = ""
-            filter_applied = False
             
-            if location_info.get('has_location') and len(hospitals) < original_count:
-                filter_applied = True
-                if location_info.get('district'):
-                    location_hint = f"\n📍 Район: {location_info['district'].title()}"
-                elif location_info.get('near_center'):
+            if filter_applied:
+                if district:
+                    location_hint = _format_district(district)
+                elif near_center:
                     location_hint = "\n📍 Центр города"
                 else:
-                    # Extract location from query
-                    location_words = [w for w in user_query.split() if len(w) > 3]
+                    # Extract location from query (first 3 significant words)
+                    location_words = []
+                    for word in user_query.split():
+                        if len(word) > 3:
+                            location_words.append(word)
+                            if len(location_words) == 3:
+                                break
                     if location_words:
-                        location_hint = f"\n📍 Адрес: {' '.join(location_words[:3])}"
+                        location_hint = f"\n📍 Адрес: {' '.join(location_words)}"
             
             # Build message
-            if filter_applied:
-                message_text = (
-                    f"✅ <b>Отфильтровал результаты по вашему запросу!</b>\n\n"
-                    f"🏥 <b>Найдено больниц: {len(hospitals)}</b> (из {original_count})\n"
-                    f"Специальность: <b>{specialty_name}</b>{location_hint}\n\n"
-                    f"Выберите медицинское учреждение:"
-                )
-            else:
-                message_text = (
-                    f"🏥 <b>Выберите медицинское учреждение:</b>\n\n"
-                    f"Специальность: <b>{specialty_name}</b>\n"
-                    f"Найдено: <b>{len(hospitals)}</b> больниц{location_hint}"
-                )
-            
-            await message.answer(
-                message_text,
-                reply_markup=keyboard,
-                parse_mode="HTML"
+            template = (
+                Messages.AI_HOSPITALS_FILTERED if filter_applied
+                else Messages.AI_HOSPITALS_UNFILTERED
             )
+            message_text = template.format(
+                count=len(hospitals),
+                total=original_count,
+                specialty=specialty_name,
+                location_hint=location_hint,
+            )
+            
+            await _render_hospitals(message, hospitals, hospital_ids, message_text)
             
             await state.set_state(SearchStates.selecting_hospital)
         
     except Exception as e:
-        logger.error(f"Error in AI search: {e}")
+        logger.error("Error in AI search: %s", e)
         await message.answer(
             "Произошла ошибка при обработке запроса. Попробуйте еще раз или используйте обычный поиск.",
             reply_markup=build_start_keyboard()
         )
+    finally:
+        if pending:
+            await state.update_data(**pending)
 
 
 @router.message(SearchStates.selecting_doctor)
 async def handle_text_during_doctor_selection(message: Message, state: FSMContext):
     """Handle text messages during doctor selection."""
-    logger.info(f"Text message during doctor selection: {message.text[:50]}...")
+    logger.info("Text message during doctor selection: %s...", message.text[:50])
     
     await message.answer(
         "Пожалуйста, выберите врача из списка выше, используя кнопки.\n\n"
@@ -268,9 +352,11 @@ async def handle_text_during_doctor_selection(message: Message, state: FSMContex
 
 
 @router.callback_query(F.data.startswith("ai_hospital:"))
-async def select_ai_hospital(callback: CallbackQuery, state: FSMContext):
+async def select_ai_hospital(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Handle hospital selection from AI search."""
-    hospital_id = int(callback.data.split(":")[1])
+    hospital_id = parse_cb(callback.data)[0]
     
     try:
         data = await state.get_data()
@@ -281,12 +367,6 @@ async def select_ai_hospital(callback: CallbackQuery, state: FSMContext):
             await callback.answer("Ошибка: специальность не выбрана", show_alert=True)
             return
         
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-        
         # Get doctors
         doctors_data = await data_service.get_doctors(
             hospital_id=hospital_id, specialty_id=specialty_id, limit=100
@@ -309,16 +389,12 @@ async def select_ai_hospital(callback: CallbackQuery, state: FSMContext):
         )
         
         # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
+        await safe_delete(callback.message)
         
         await callback.message.answer(
             f"👨‍⚕️ <b>Выберите врача:</b>\n\n"
             f"Специальность: <b>{specialty_name}</b>",
             reply_markup=keyboard,
-            parse_mode="HTML",
         )
         
         # Store hospital ID
@@ -327,24 +403,20 @@ async def select_ai_hospital(callback: CallbackQuery, state: FSMContext):
         await callback.answer()
         
     except Exception as e:
-        logger.error(f"Error selecting hospital: {e}")
+        logger.error("Error selecting hospital: %s", e)
         await callback.answer("Ошибка при загрузке данных", show_alert=True)
 
 
 @router.message(SearchStates.selecting_hospital)
-async def handle_text_during_hospital_selection(message: Message, state: FSMContext):
+async def handle_text_during_hospital_selection(
+    message: Message,
+    state: FSMContext,
+    data_service: StandaloneDataService,
+    ai_assistant: AIAssistant,
+):
     """Handle text messages during hospital selection - refine by location."""
-    logger.info(f"Refining search with: {message.text[:50]}...")
-    
-    user_query = message.text.strip()
-    
-    # Get services
-    data_service = await get_data_service(message)
-    ai_assistant = await get_ai_assistant(message)
-    
-    if not data_service or not ai_assistant:
-        await message.answer("Ошибка сервиса.")
-        return
+    user_query = _clean_query(message.text)
+    logger.info("Refining search with: %s...", user_query[:50])
     
     # Get current search data
     data = await state.get_data()
@@ -362,7 +434,7 @@ async def handle_text_during_hospital_selection(message: Message, state: FSMCont
         # Extract location info from new query
         location_info = ai_assistant._extract_location_info(user_query)
         
-        if not location_info.get('has_location'):
+        if not location_info.has_location:
             await message.answer(
                 "Не могу определить адрес или район. 🤔\n\n"
                 "Попробуйте указать:\n"
@@ -373,10 +445,7 @@ async def handle_text_during_hospital_selection(message: Message, state: FSMCont
             return
         
         # Get hospitals for this specialty
-        hospitals_data = await data_service.get_hospitals(
-            specialty_id=specialty_id, limit=100
-        )
-        hospitals = hospitals_data.get('items', [])
+        hospitals = await cached_get_hospitals(message.bot, data_service, specialty_id)
         
         # Filter by location using AI with real addresses from DB
         filtered_hospitals = await ai_assistant.filter_hospitals_by_location(
@@ -396,83 +465,74 @@ async def handle_text_during_hospital_selection(message: Message, state: FSMCont
             return
         
         # Update location info and filtered list in state
+        hospital_ids = [h['id'] for h in filtered_hospitals]
         await state.update_data(
-            location_info=location_info,
-            filtered_hospitals=[h['id'] for h in filtered_hospitals],
+            location_info=location_info.to_dict(),
+            filtered_hospitals=tuple(hospital_ids),
             filter_applied=True,
-            original_count=len(hospitals)
-        )
-        
-        # Show filtered hospitals
-        keyboard = build_paginated_keyboard(
-            items=filtered_hospitals,
-            callback_prefix="ai_hospital",
-            page=1,
-            total_pages=1,
-            id_key="id",
-            name_key="name",
         )
         
         location_hint = ""
-        if location_info.get('district'):
-            location_hint = f"\n📍 Район: {location_info['district'].title()}"
-        elif location_info.get('near_center'):
+        if location_info.district:
+            location_hint = _format_district(location_info.district)
+        elif location_info.near_center:
             location_hint = "\n📍 Центр города"
         else:
             location_hint = f"\n📍 {user_query}"
         
-        await message.answer(
-            f"✅ <b>Отфильтровал результаты по вашему запросу!</b>\n\n"
-            f"🏥 <b>Найдено больниц: {len(filtered_hospitals)}</b>\n"
-            f"Специальность: <b>{specialty_name}</b>{location_hint}\n\n"
-            f"Выберите медицинское учреждение:",
-            reply_markup=keyboard,
-            parse_mode="HTML"
+        await _render_hospitals(
+            message,
+            filtered_hospitals,
+            hospital_ids,
+            Messages.AI_HOSPITALS_REFINED.format(
+                count=len(filtered_hospitals),
+                specialty=specialty_name,
+                location_hint=location_hint,
+            ),
         )
         
-        logger.info(f"Filtered hospitals: {len(filtered_hospitals)} results")
+        logger.info("Filtered hospitals: %d results", len(filtered_hospitals))
         
     except Exception as e:
-        logger.error(f"Error refining search: {e}")
+        logger.error("Error refining search: %s", e)
         await message.answer(
             "Произошла ошибка при фильтрации. Выберите больницу из списка выше."
         )
 
 
 @router.callback_query(F.data == "back_to_ai_hospitals")
-async def back_to_ai_hospitals(callback: CallbackQuery, state: FSMContext):
+async def back_to_ai_hospitals(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Go back to hospital selection in AI search - preserve filters."""
     try:
         data = await state.get_data()
         specialty_id = data.get("specialty_id")
         specialty_name = data.get("specialty_name")
         location_info = data.get("location_info", {})
-        filtered_hospital_ids = data.get("filtered_hospitals", [])
+        filtered_hospital_ids = data.get("filtered_hospitals", ())
         filter_applied = data.get("filter_applied", False)
-        original_count = data.get("original_count", 0)
         
         if not specialty_id:
             await callback.answer("Ошибка: специальность не выбрана", show_alert=True)
             return
         
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-        
         # Get all hospitals
-        hospitals_data = await data_service.get_hospitals(
-            specialty_id=specialty_id, limit=100
+        all_hospitals, hospitals_by_id = await cached_get_hospitals_index(
+            callback.bot, data_service, specialty_id
         )
-        all_hospitals = hospitals_data.get('items', [])
+        original_count = len(all_hospitals)
         
-        # Apply saved filter if exists
+        # Apply saved filter if exists, keeping the order the user saw
         if filtered_hospital_ids:
-            logger.info(f"Restoring from saved IDs: {filtered_hospital_ids}")
-            hospitals = [h for h in all_hospitals if h['id'] in filtered_hospital_ids]
-            logger.info(f"Restored filtered hospitals: {len(hospitals)} from {len(filtered_hospital_ids)} saved IDs")
-            logger.info(f"Restored hospital IDs: {[h['id'] for h in hospitals]}")
+            logger.info("Restoring from saved IDs: %s", filtered_hospital_ids)
+            hospitals = [
+                hospitals_by_id[i] for i in filtered_hospital_ids if i in hospitals_by_id
+            ]
+            logger.info(
+                "Restored filtered hospitals: %d from %d saved IDs",
+                len(hospitals), len(filtered_hospital_ids),
+            )
         else:
             hospitals = all_hospitals
         
@@ -480,57 +540,38 @@ async def back_to_ai_hospitals(callback: CallbackQuery, state: FSMContext):
             await callback.answer("Больницы не найдены", show_alert=True)
             return
         
-        # Build keyboard
-        keyboard = build_paginated_keyboard(
-            items=hospitals,
-            callback_prefix="ai_hospital",
-            page=1,
-            total_pages=1,
-            id_key="id",
-            name_key="name",
-        )
-        
         # Build message with location info
         location_hint = ""
         
         if filter_applied and location_info.get('has_location'):
             if location_info.get('district'):
-                location_hint = f"\n📍 Район: {location_info['district'].title()}"
+                location_hint = _format_district(location_info['district'])
             elif location_info.get('near_center'):
                 location_hint = "\n📍 Центр города"
             else:
                 location_hint = "\n📍 По указанному адресу"
         
         # Build message
-        if filter_applied:
-            message_text = (
-                f"✅ <b>Отфильтрованные результаты</b>\n\n"
-                f"🏥 <b>Найдено больниц: {len(hospitals)}</b> (из {original_count})\n"
-                f"Специальность: <b>{specialty_name}</b>{location_hint}\n\n"
-                f"Выберите медицинское учреждение:"
-            )
-        else:
-            message_text = (
-                f"🏥 <b>Выберите медицинское учреждение:</b>\n\n"
-                f"Специальность: <b>{specialty_name}</b>\n"
-                f"Найдено: <b>{len(hospitals)}</b> больниц"
-            )
+        template = (
+            Messages.AI_HOSPITALS_RESTORED if filter_applied
+            else Messages.AI_HOSPITALS_UNFILTERED
+        )
+        message_text = template.format(
+            count=len(hospitals),
+            total=original_count,
+            specialty=specialty_name,
+            location_hint=location_hint,
+        )
         
         # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
+        await safe_delete(callback.message)
         
-        await callback.message.answer(
-            message_text,
-            reply_markup=keyboard,
-            parse_mode="HTML",
-        )
+        hospital_ids = [h['id'] for h in hospitals]
+        await _render_hospitals(callback.message, hospitals, hospital_ids, message_text)
         
         await state.set_state(SearchStates.selecting_hospital)
         await callback.answer()
         
     except Exception as e:
-        logger.error(f"Error going back to hospitals: {e}")
+        logger.error("Error going back to hospitals: %s", e)
         await callback.answer("Ошибка при загрузке данных", show_alert=True)
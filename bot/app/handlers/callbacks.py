@@ -0,0 +1,73 @@
+"""Single entry point for callback queries of the search, review and menu screens.
+
+Instead of letting aiogram test a ``F.data`` filter per handler, the
+callback prefix (text before the first ":") is looked up in a table.
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Tuple
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.types import CallbackQuery
+
+from app.handlers import standalone_review, standalone_search, start
+
+router = Router()
+
+CallbackHandler = Callable[..., Awaitable[Any]]
+
+
+def _data_params(handler: CallbackHandler) -> FrozenSet[str]:
+    """Names of the workflow data arguments (state, data_service, ...) a handler takes."""
+    params = list(inspect.signature(handler).parameters)
+    return frozenset(params[1:])
+
+
+# Each handler receives only the workflow data it declares, the same way
+# aiogram calls handlers; signatures are inspected once here.
+_PREFIX_TABLE: Dict[str, Tuple[CallbackHandler, FrozenSet[str]]] = {
+    prefix: (handler, _data_params(handler))
+    for prefix, handler in {
+        # Menu
+        "start": start.callback_start,
+        "help": start.callback_help,
+        "cancel": start.callback_cancel,
+        # Search
+        "find_doctor": standalone_search.start_search,
+        "specialty": standalone_search.select_specialty,
+        "hospital": standalone_search.select_hospital,
+        "doctor": standalone_search.select_doctor,
+        "back_to_doctors": standalone_search.back_to_doctors,
+        "back_to_hospitals": standalone_search.back_to_hospitals,
+        "back_to_specialties": standalone_search.back_to_specialties,
+        "new_search": standalone_search.new_search,
+        "back_to_doctor": standalone_search.back_to_doctor,
+        # Reviews
+        "reviews": standalone_review.show_reviews,
+        "write_review": standalone_review.start_write_review,
+        "cancel_review": standalone_review.cancel_review,
+    }.items()
+}
+
+
+@router.callback_query()
+async def dispatch_cb(callback: CallbackQuery, **kwargs: Any) -> Any:
+    """
+    Route callback query to its handler by callback data prefix.
+
+    Unknown prefixes are skipped so other routers (e.g. AI search) get them.
+
+    Args:
+        callback: Callback query
+        **kwargs: Workflow data passed by the dispatcher
+
+    Returns:
+        Handler result
+    """
+    prefix = (callback.data or "").split(":", 1)[0]
+    entry = _PREFIX_TABLE.get(prefix)
+    if entry is None:
+        raise SkipHandler()
+    handler, params = entry
+    return await handler(callback, **{name: kwargs[name] for name in params if name in kwargs})
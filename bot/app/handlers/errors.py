@@ -0,0 +1,40 @@
+"""Fallback handler for errors not handled by the handlers themselves."""
+
+import logging
+
+from aiogram.types import ErrorEvent
+
+from app.constants import Messages
+
+logger = logging.getLogger(__name__)
+
+
+async def handle_error(event: ErrorEvent) -> bool:
+    """
+    Log unexpected error and notify the user.
+
+    Registered on the dispatcher, so it sees errors from every router.
+
+    Args:
+        event: Error event with the failed update and exception
+
+    Returns:
+        True to mark the error as handled
+    """
+    logger.error(
+        "Unhandled error in update %s: %s",
+        event.update.update_id,
+        event.exception,
+        exc_info=event.exception,
+    )
+
+    update = event.update
+    try:
+        if update.callback_query:
+            await update.callback_query.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
+        elif update.message:
+            await update.message.answer(Messages.ERROR_LOADING_DATA)
+    except Exception as e:
+        logger.warning("Failed to notify user about error: %s", e)
+
+    return True
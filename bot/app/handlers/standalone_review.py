@@ -1,45 +1,190 @@
 """Standalone review handlers - works without backend."""
 
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
+import asyncio
 import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 from app.keyboards.inline import build_reviews_keyboard, build_cancel_keyboard
 from app.states.review import ReviewStates
-from app.states.search import SearchData
-from app.utils import safe_message_transition
+from app.services.standalone_service import StandaloneDataService
+from app.utils import (
+    BACKEND_ERRORS,
+    parse_cb,
+    safe_delete,
+    safe_message_transition,
+    set_state_and_data,
+)
 from app.constants import Messages, Limits
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+_REVIEW_MIN = Limits.REVIEW_MIN_LENGTH
+_REVIEW_MAX = Limits.REVIEW_MAX_LENGTH
+REVIEW_TOO_SHORT = f"❌ Отзыв слишком короткий. Минимум {_REVIEW_MIN} символов."
+REVIEW_TOO_LONG = f"❌ Отзыв слишком длинный. Максимум {_REVIEW_MAX} символов."
 
-async def get_data_service(callback_or_message):
-    """Get data service from bot context."""
-    # Try to get from bot's context
-    if hasattr(callback_or_message.bot, '_data_service'):
-        return callback_or_message.bot._data_service
-    return None
+# Submitted reviews are queued and written in batches by a background task
+REVIEW_BATCH_SIZE = 64
+REVIEW_FLUSH_INTERVAL = 0.2
+REVIEW_QUEUE_SIZE = 1000
 
 
-@router.callback_query(F.data.startswith("reviews:"))
-async def show_reviews(callback: CallbackQuery, state: FSMContext):
+def _new_future() -> "asyncio.Future[None]":
+    """Create a future on the running loop."""
+    return asyncio.get_running_loop().create_future()
+
+
+@dataclass
+class ReviewItem:
+    """Review waiting to be written.
+
+    ``done`` is resolved by the writer once the batch holding the review
+    was saved, or set to the error that prevented it.
+    """
+
+    doctor_id: int
+    hospital_id: int
+    user_name: str
+    review_text: str
+    done: "asyncio.Future[None]" = field(default_factory=_new_future)
+
+    def to_row(self) -> Dict[str, Any]:
+        """Column values for create_reviews_bulk()."""
+        return {
+            "doctor_id": self.doctor_id,
+            "hospital_id": self.hospital_id,
+            "user_name": self.user_name,
+            "review_text": self.review_text,
+        }
+
+
+# Created by start_review_flusher() so both belong to the loop running the bot.
+# None in the queue tells flush_loop() to stop
+_review_queue: "Optional[asyncio.Queue[Optional[ReviewItem]]]" = None
+_flush_task: Optional[asyncio.Task] = None
+
+
+async def _write_batch(
+    data_service: StandaloneDataService, batch: List[ReviewItem]
+) -> None:
+    """Write a batch of reviews and report the outcome to each submitter."""
+    try:
+        await data_service.create_reviews_bulk([item.to_row() for item in batch])
+    except BACKEND_ERRORS as e:
+        logger.error("Error creating %s reviews: %s", len(batch), e)
+        for item in batch:
+            if not item.done.done():
+                item.done.set_exception(e)
+    else:
+        for item in batch:
+            if not item.done.done():
+                item.done.set_result(None)
+
+
+async def flush_loop(
+    data_service: StandaloneDataService, queue: "asyncio.Queue[Optional[ReviewItem]]"
+) -> None:
+    """
+    Drain the review queue until a None item arrives.
+
+    Each batch holds up to REVIEW_BATCH_SIZE reviews collected within
+    REVIEW_FLUSH_INTERVAL seconds of the first one.
+
+    Args:
+        data_service: Data service with create_reviews_bulk() method
+        queue: Queue filled by submit_review()
+    """
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        item = await queue.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = loop.time() + REVIEW_FLUSH_INTERVAL
+        while len(batch) < REVIEW_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        await _write_batch(data_service, batch)
+
+
+def start_review_flusher(data_service: StandaloneDataService) -> None:
+    """Start the background review writer, called once at startup."""
+    global _review_queue, _flush_task
+    if _flush_task is None or _flush_task.done():
+        _review_queue = asyncio.Queue(maxsize=REVIEW_QUEUE_SIZE)
+        _flush_task = asyncio.create_task(flush_loop(data_service, _review_queue))
+
+
+async def stop_review_flusher(data_service: StandaloneDataService) -> None:
+    """Stop the background writer after it wrote the reviews already queued."""
+    global _review_queue, _flush_task
+    if _flush_task is None:
+        return
+
+    queue, task = _review_queue, _flush_task
+    _review_queue = _flush_task = None
+    if not task.done():
+        # The queue is FIFO, so everything submitted before the stop is written
+        await queue.put(None)
+        await task
+
+    # Reviews submitted while the writer was stopping
+    batch = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        if item is not None:
+            batch.append(item)
+    if batch:
+        await _write_batch(data_service, batch)
+
+
+async def submit_review(data_service: StandaloneDataService, item: ReviewItem) -> None:
+    """
+    Save a review through the batch writer and wait until it is written.
+
+    Without a running writer the review is written right away.
+
+    Args:
+        data_service: Data service with create_reviews_bulk() method
+        item: Review to save
+
+    Raises:
+        Any of BACKEND_ERRORS raised while writing the review's batch
+    """
+    if _review_queue is None:
+        await _write_batch(data_service, [item])
+    else:
+        await _review_queue.put(item)
+    await item.done
+
+
+async def show_reviews(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Show reviews for doctor."""
-    doctor_id = int(callback.data.split(":")[1])
+    doctor_id = parse_cb(callback.data)[0]
 
     try:
         # Get hospital_id from state
         data = await state.get_data()
         hospital_id = data.get("hospital_id", 0)
         
-        logger.info(f"Showing reviews for doctor_id={doctor_id}, hospital_id={hospital_id}")
-
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
+        logger.info("Showing reviews for doctor_id=%s, hospital_id=%s", doctor_id, hospital_id)
 
         # Get reviews
         reviews = await data_service.get_reviews(doctor_id=doctor_id)
@@ -47,39 +192,42 @@ async def show_reviews(callback: CallbackQuery, state: FSMContext):
         if not reviews:
             text = "📝 <b>Отзывы</b>\n\nПока нет отзывов об этом враче.\nБудьте первым!"
         else:
-            text = "📝 <b>Отзывы</b>\n\n"
-
-            for review in reviews[:10]:  # Show max 10 reviews
-                user = review.get("user_name", "Аноним")
-                review_text = review.get("review_text", "")
-                date = review.get("created_at", "")[:10]  # YYYY-MM-DD
-
-                text += f"👤 <b>{user}</b> ({date})\n{review_text}\n\n"
+            parts = ["📝 <b>Отзывы</b>\n"]
+            # Show max 10 reviews, created_at trimmed to YYYY-MM-DD
+            parts.extend(
+                f"👤 <b>{review.get('user_name', 'Аноним')}</b> "
+                f"({review.get('created_at', '')[:10]})\n"
+                f"{review.get('review_text', '')}\n"
+                for review in reviews[:10]
+            )
+            text = "\n".join(parts)
 
         keyboard = build_reviews_keyboard(doctor_id, hospital_id)
 
         await safe_message_transition(callback, text, reply_markup=keyboard)
         await callback.answer()
 
-    except Exception as e:
-        logger.error(f"Error showing reviews: {e}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error showing reviews: %s", e)
         await callback.answer("Ошибка при загрузке отзывов", show_alert=True)
 
 
-@router.callback_query(F.data.startswith("write_review:"))
 async def start_write_review(callback: CallbackQuery, state: FSMContext):
     """Start writing review process."""
-    logger.info(f"Starting write review, callback data: {callback.data}")
-    doctor_id = int(callback.data.split(":")[1])
-    hospital_id = int(callback.data.split(":")[2])
+    logger.info("Starting write review, callback data: %s", callback.data)
+    doctor_id, hospital_id = parse_cb(callback.data)
 
-    logger.info(f"Parsed doctor_id={doctor_id}, hospital_id={hospital_id}")
+    logger.info("Parsed doctor_id=%s, hospital_id=%s", doctor_id, hospital_id)
     
     # Store doctor and hospital IDs
-    await state.update_data(doctor_id=doctor_id, hospital_id=hospital_id)
-    await state.set_state(ReviewStates.waiting_for_review)
+    await set_state_and_data(
+        state,
+        ReviewStates.waiting_for_review,
+        doctor_id=doctor_id,
+        hospital_id=hospital_id,
+    )
     
-    logger.info(f"State updated with doctor_id={doctor_id}, hospital_id={hospital_id}")
+    logger.info("State updated with doctor_id=%s, hospital_id=%s", doctor_id, hospital_id)
 
     text = (
         "✍️ <b>Написать отзыв</b>\n\n"
@@ -89,54 +237,49 @@ async def start_write_review(callback: CallbackQuery, state: FSMContext):
     )
 
     # Delete previous message and send new one
-    try:
-        await callback.message.delete()
-    except Exception:
-        pass
-    
+    await safe_delete(callback.message)
     await callback.message.answer(
         text,
         reply_markup=build_cancel_keyboard(),
-        parse_mode="HTML",
     )
     await callback.answer()
 
 
 @router.message(ReviewStates.waiting_for_review)
-async def process_review(message: Message, state: FSMContext):
+async def process_review(
+    message: Message, state: FSMContext, data_service: StandaloneDataService
+):
     """Process review text."""
-    review_text = message.text.strip()
+    review_text = message.text or ""
+    # Reject obviously oversized text before strip() copies it
+    if len(review_text) > _REVIEW_MAX * 2:
+        await message.answer(REVIEW_TOO_LONG)
+        return
+
+    # Strip only when there is surrounding whitespace to avoid a copy
+    if review_text[:1].isspace() or review_text[-1:].isspace():
+        review_text = review_text.strip()
+    length = len(review_text)
 
     # Validate review length
-    if len(review_text) < Limits.REVIEW_MIN_LENGTH:
-        await message.answer(
-            f"❌ Отзыв слишком короткий. Минимум {Limits.REVIEW_MIN_LENGTH} символов."
-        )
+    if length < _REVIEW_MIN:
+        await message.answer(REVIEW_TOO_SHORT)
         return
 
-    if len(review_text) > Limits.REVIEW_MAX_LENGTH:
-        await message.answer(
-            f"❌ Отзыв слишком длинный. Максимум {Limits.REVIEW_MAX_LENGTH} символов."
-        )
+    if length > _REVIEW_MAX:
+        await message.answer(REVIEW_TOO_LONG)
         return
 
     try:
-        # Get data service
-        data_service = await get_data_service(message)
-        if not data_service:
-            await message.answer("Ошибка сервиса данных")
-            await state.clear()
-            return
-
         # Get stored data
         data = await state.get_data()
         doctor_id = data.get("doctor_id")
         hospital_id = data.get("hospital_id")
 
-        logger.info(f"Retrieved from state: doctor_id={doctor_id}, hospital_id={hospital_id}")
+        logger.info("Retrieved from state: doctor_id=%s, hospital_id=%s", doctor_id, hospital_id)
 
         if not doctor_id or not hospital_id:
-            logger.error(f"Missing data in state: doctor_id={doctor_id}, hospital_id={hospital_id}, full_data={data}")
+            logger.error("Missing data in state: doctor_id=%s, hospital_id=%s, full_data=%s", doctor_id, hospital_id, data)
             await message.answer("Ошибка: не найдены данные о враче")
             await state.clear()
             return
@@ -144,12 +287,15 @@ async def process_review(message: Message, state: FSMContext):
         # Get user name
         user_name = message.from_user.full_name or message.from_user.username or "Аноним"
 
-        # Create review
-        await data_service.create_review(
-            doctor_id=doctor_id,
-            hospital_id=hospital_id,
-            user_name=user_name,
-            review_text=review_text,
+        # Written together with other reviews submitted at about the same time
+        await submit_review(
+            data_service,
+            ReviewItem(
+                doctor_id=doctor_id,
+                hospital_id=hospital_id,
+                user_name=user_name,
+                review_text=review_text,
+            ),
         )
 
         # Import keyboard function
@@ -159,19 +305,17 @@ async def process_review(message: Message, state: FSMContext):
             "✅ <b>Отзыв успешно добавлен!</b>\n\nСпасибо за ваш отзыв. "
             "Он поможет другим пользователям при выборе врача.",
             reply_markup=build_review_success_keyboard(doctor_id),
-            parse_mode="HTML",
         )
 
         # Clear FSM state but keep data (doctor_id, hospital_id) for navigation
         await state.set_state(None)
 
-    except Exception as e:
-        logger.error(f"Error creating review: {e}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error creating review: %s", e)
         await message.answer("❌ Ошибка при сохранении отзыва. Попробуйте позже.")
         await state.clear()
 
 
-@router.callback_query(F.data == "cancel_review")
 async def cancel_review(callback: CallbackQuery, state: FSMContext):
     """Cancel review writing."""
     await state.clear()
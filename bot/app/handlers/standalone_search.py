@@ -1,31 +1,99 @@
-"""Standalone doctor search handlers - works without backend."""
+"""Standalone doctor search handlers - works without backend.
 
-from aiogram import Router, F
-from aiogram.types import CallbackQuery, BufferedInputFile
+Callback queries reach these handlers through app.handlers.callbacks.
+"""
+
+import asyncio
+from contextlib import suppress
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, CallbackQuery, InputMediaPhoto, Message
 from aiogram.fsm.context import FSMContext
 import logging
+from typing import Any, Dict, Optional, Tuple
 
 from app.keyboards.inline import build_paginated_keyboard, build_doctor_actions_keyboard
-from app.states.search import SearchStates, SearchData
-from app.utils import safe_message_transition, safe_edit_markup
+from app.states.search import SearchStates
+from app.services.standalone_service import StandaloneDataService
+from app.utils import (
+    BACKEND_ERRORS,
+    TTLCache,
+    cached_call,
+    parse_cb,
+    safe_delete,
+    safe_edit_markup,
+    safe_message_transition,
+    set_state_and_data,
+)
 from app.constants import Messages, LogMessages
 
-router = Router()
 logger = logging.getLogger(__name__)
 
 
-async def get_data_service(callback: CallbackQuery):
-    """Get data service from bot context."""
-    # Try to get from bot's context
-    if hasattr(callback.bot, '_data_service'):
-        return callback.bot._data_service
-    return None
+# Hospital addresses practically never move, so coordinates are kept for a day
+GEOCODE_CACHE_TTL = 24 * 60 * 60
+_geo_cache = TTLCache(ttl=GEOCODE_CACHE_TTL, maxsize=2048)
+
+# Doctor details are only reused briefly, e.g. between selection and card
+DOCTOR_CACHE_TTL = 10
+
+# Static map PNGs by rounded (lon, lat) and Telegram file_ids of uploaded maps
+MAP_CACHE_TTL = 24 * 60 * 60
+_map_bytes_cache = TTLCache(ttl=MAP_CACHE_TTL, maxsize=256)
+_map_file_id_cache = TTLCache(ttl=MAP_CACHE_TTL, maxsize=2048)
+
+
+async def geocode_cached(
+    data_service: StandaloneDataService, address: str
+) -> Tuple[float, float]:
+    """
+    Geocode address once and reuse the coordinates for later card views.
+
+    Concurrent first-time lookups of the same address share one request.
+
+    Args:
+        data_service: Data service with geocode() method
+        address: Address to geocode
+
+    Returns:
+        Tuple of (lon, lat)
+    """
+    key = " ".join(address.lower().split())
+
+    async def load() -> Tuple[float, float]:
+        coords = await data_service.geocode(address)
+        return coords["lon"], coords["lat"]
+
+    return await _geo_cache.get_or_load(key, load)
+
+
+async def get_doctor_cached(
+    data_service: StandaloneDataService, doctor_id: int, hospital_id: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Get doctor details, sharing one backend call between close requests.
+
+    Args:
+        data_service: Data service with get_doctor() method
+        doctor_id: Doctor ID
+        hospital_id: Hospital ID
+
+    Returns:
+        Doctor details or None if not found
+    """
+    return await cached_call(
+        ("doctor", doctor_id, hospital_id),
+        lambda: data_service.get_doctor(doctor_id=doctor_id, hospital_id=hospital_id),
+        ttl=DOCTOR_CACHE_TTL,
+    )
 
 
 async def show_doctor_card(
     callback: CallbackQuery,
     doctor_id: int,
     hospital_id: int,
+    data_service: StandaloneDataService,
+    doctor: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Show doctor card with map.
@@ -34,54 +102,66 @@ async def show_doctor_card(
         callback: Callback query
         doctor_id: Doctor ID
         hospital_id: Hospital ID
+        data_service: Data service
+        doctor: Already fetched doctor details, loaded when omitted
     """
     try:
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-
         # Get doctor details
-        doctor = await data_service.get_doctor(
-            doctor_id=doctor_id, hospital_id=hospital_id
-        )
+        if doctor is None:
+            doctor = await get_doctor_cached(data_service, doctor_id, hospital_id)
 
         if not doctor:
             await callback.answer("Врач не найден", show_alert=True)
             return
 
+        has_address = bool(doctor.get("address")) and doctor["address"] != "Адрес не указан"
+
+        # Start geocoding (requires API key) and build the text meanwhile
+        geo_task = None
+        if data_service.yandex_api_key and has_address:
+            geo_task = asyncio.create_task(
+                geocode_cached(data_service, doctor["address"])
+            )
+
+        # Build message
+        lines = [
+            f"👨‍⚕️ <b>{doctor['name']}</b>\n",
+            f"🏥 <b>Больница:</b> {doctor['hospital_name']}",
+            f"🩺 <b>Специальность:</b> {doctor['specialty_name']}",
+        ]
+        if has_address:
+            lines.append(f"📍 <b>Адрес:</b> {doctor['address']}")
+        lines.append("")
+        message = "\n".join(lines)
+
         # Get coordinates for map link and static map
         lon, lat = 0, 0
         coords_available = False
-        
-        # Try to geocode address (requires API key)
-        if data_service.yandex_api_key and doctor.get("address") and doctor["address"] != "Адрес не указан":
+        if geo_task is not None:
             try:
-                coords = await data_service.geocode(doctor["address"])
-                lon, lat = coords["lon"], coords["lat"]
+                lon, lat = await geo_task
                 coords_available = True
-                logger.info(f"Geocoded address: {doctor['address']} -> {lon}, {lat}")
-            except Exception as e:
-                logger.warning(f"Failed to geocode address: {e}")
+                logger.info("Geocoded address: %s -> %s, %s", doctor["address"], lon, lat)
+            except BACKEND_ERRORS as e:
+                logger.warning("Failed to geocode address: %s", e)
         
         # Try to get static map (doesn't require API key!)
+        # Prefer a Telegram file_id from an earlier upload, then cached bytes
         map_photo = None
-        if coords_available:
+        map_key = (round(lon, 5), round(lat, 5))
+        map_file_id = _map_file_id_cache.get(map_key) if coords_available else None
+        if map_file_id:
+            map_photo = map_file_id
+        elif coords_available:
             try:
-                map_photo = await data_service.get_static_map(lon=lon, lat=lat)
+                map_bytes = await _map_bytes_cache.get_or_load(
+                    map_key, lambda: data_service.get_static_map(lon=lon, lat=lat)
+                )
+                map_photo = BufferedInputFile(map_bytes, filename="map.png")
                 logger.info("✅ Static map loaded successfully!")
-            except Exception as e:
-                logger.error(f"Failed to load static map: {e}")
+            except BACKEND_ERRORS as e:
+                logger.error("Failed to load static map: %s", e)
 
-        # Build message
-        message = f"👨‍⚕️ <b>{doctor['name']}</b>\n\n"
-        message += f"🏥 <b>Больница:</b> {doctor['hospital_name']}\n"
-        message += f"🩺 <b>Специальность:</b> {doctor['specialty_name']}\n"
-        
-        if doctor.get("address") and doctor["address"] != "Адрес не указан":
-            message += f"📍 <b>Адрес:</b> {doctor['address']}\n"
-        
         # Send message with or without map
         keyboard = build_doctor_actions_keyboard(
             doctor_id=doctor_id,
@@ -90,46 +170,45 @@ async def show_doctor_card(
             lat=lat,
         )
         
-        # Delete previous message
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
-        
-        # Send message with or without photo
+        # Send message with or without photo, editing in place when the type matches
         if map_photo:
-            await callback.message.answer_photo(
-                BufferedInputFile(map_photo, filename="map.png"),
-                caption=message,
-                reply_markup=keyboard,
-                parse_mode="HTML",
-            )
+            sent = None
+            # Inaccessible (too old or deleted) messages fall through to answer_photo
+            if isinstance(callback.message, Message) and callback.message.photo:
+                with suppress(TelegramBadRequest):
+                    sent = await callback.message.edit_media(
+                        InputMediaPhoto(media=map_photo, caption=message),
+                        reply_markup=keyboard,
+                    )
+            if not sent:
+                await safe_delete(callback.message)
+                sent = await callback.message.answer_photo(
+                    map_photo,
+                    caption=message,
+                    reply_markup=keyboard,
+                )
+            # Remember the uploaded photo so next time only its id is sent
+            if not map_file_id and isinstance(sent, Message) and sent.photo:
+                _map_file_id_cache.set(map_key, sent.photo[-1].file_id)
         else:
-            await callback.message.answer(
-                message,
-                reply_markup=keyboard,
-                parse_mode="HTML",
-            )
+            await safe_message_transition(callback, message, reply_markup=keyboard)
 
         await callback.answer()
 
-    except Exception as e:
+    except BACKEND_ERRORS as e:
         logger.error(LogMessages.ERROR_SHOWING_DOCTOR_CARD.format(error=e))
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data == "find_doctor")
-async def start_search(callback: CallbackQuery, state: FSMContext):
+async def start_search(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Start doctor search process."""
     try:
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-
         # Get specialties
-        specialties_data = await data_service.get_specialties(limit=100)
+        specialties_data = await cached_call(
+            ("spec",), lambda: data_service.get_specialties(limit=100)
+        )
         specialties = specialties_data.get("items", [])
 
         if not specialties:
@@ -146,41 +225,32 @@ async def start_search(callback: CallbackQuery, state: FSMContext):
             name_key="name",
         )
 
-        # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
-        
-        await callback.message.answer(
+        await safe_message_transition(
+            callback,
             "🔍 <b>Поиск врача</b>\n\nШаг 1 из 3: Выберите специальность врача",
             reply_markup=keyboard,
-            parse_mode="HTML",
         )
 
         await state.set_state(SearchStates.selecting_specialty)
         await callback.answer()
 
-    except Exception as e:
-        logger.error(f"Error starting search: {e}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error starting search: %s", e)
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data.startswith("specialty:"))
-async def select_specialty(callback: CallbackQuery, state: FSMContext):
+async def select_specialty(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Handle specialty selection."""
-    logger.info(f"Callback data: {callback.data}")
+    logger.info("Callback data: %s", callback.data)
     try:
-        specialty_id = int(callback.data.split(":")[1])
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
+        specialty_id = parse_cb(callback.data)[0]
 
         # Get hospitals for this specialty
-        hospitals_data = await data_service.get_hospitals(
-            specialty_id=specialty_id, limit=100
+        hospitals_data = await cached_call(
+            ("hosp", specialty_id),
+            lambda: data_service.get_hospitals(specialty_id=specialty_id, limit=100),
         )
         hospitals = hospitals_data.get("items", [])
 
@@ -199,34 +269,34 @@ async def select_specialty(callback: CallbackQuery, state: FSMContext):
             back_callback="back_to_specialties",
         )
 
-        # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
-        
-        await callback.message.answer(
+        await safe_message_transition(
+            callback,
             "🔍 <b>Поиск врача</b>\n\nШаг 2 из 3: Выберите медицинское учреждение",
             reply_markup=keyboard,
-            parse_mode="HTML",
         )
 
         # Store specialty ID
-        await state.update_data(specialty_id=specialty_id)
-        await state.set_state(SearchStates.selecting_hospital)
+        # Keep the list shown so going back needs no refetch
+        await set_state_and_data(
+            state,
+            SearchStates.selecting_hospital,
+            specialty_id=specialty_id,
+            hospitals_snapshot=[{"id": h["id"], "name": h["name"]} for h in hospitals],
+        )
         await callback.answer()
 
-    except Exception as e:
-        logger.error(f"Error selecting specialty: {e}, callback data: {callback.data}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error selecting specialty: %s, callback data: %s", e, callback.data)
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data.startswith("hospital:"))
-async def select_hospital(callback: CallbackQuery, state: FSMContext):
+async def select_hospital(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Handle hospital selection."""
-    logger.info(f"Callback data: {callback.data}")
+    logger.info("Callback data: %s", callback.data)
     try:
-        hospital_id = int(callback.data.split(":")[1])
+        hospital_id = parse_cb(callback.data)[0]
         data = await state.get_data()
         specialty_id = data.get("specialty_id")
 
@@ -234,15 +304,12 @@ async def select_hospital(callback: CallbackQuery, state: FSMContext):
             await callback.answer("Ошибка: не выбрана специальность", show_alert=True)
             return
 
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-
         # Get doctors for this hospital and specialty
-        doctors_data = await data_service.get_doctors(
-            hospital_id=hospital_id, specialty_id=specialty_id, limit=100
+        doctors_data = await cached_call(
+            ("doc", hospital_id, specialty_id),
+            lambda: data_service.get_doctors(
+                hospital_id=hospital_id, specialty_id=specialty_id, limit=100
+            ),
         )
         doctors = doctors_data.get("items", [])
 
@@ -261,34 +328,34 @@ async def select_hospital(callback: CallbackQuery, state: FSMContext):
             back_callback="back_to_hospitals",
         )
 
-        # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
-        
-        await callback.message.answer(
+        await safe_message_transition(
+            callback,
             "🔍 <b>Поиск врача</b>\n\nШаг 3 из 3: Выберите врача",
             reply_markup=keyboard,
-            parse_mode="HTML",
         )
 
-        # Store hospital ID
-        await state.update_data(hospital_id=hospital_id)
-        await state.set_state(SearchStates.selecting_doctor)
+        # Store hospital ID and the list shown, so going back needs no refetch
+        await set_state_and_data(
+            state,
+            SearchStates.selecting_doctor,
+            data,
+            hospital_id=hospital_id,
+            doctors_snapshot=[{"id": d["id"], "name": d["name"]} for d in doctors],
+        )
         await callback.answer()
 
-    except Exception as e:
-        logger.error(f"Error selecting hospital: {e}, callback data: {callback.data}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error selecting hospital: %s, callback data: %s", e, callback.data)
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data.startswith("doctor:"))
-async def select_doctor(callback: CallbackQuery, state: FSMContext):
+async def select_doctor(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Handle doctor selection."""
-    logger.info(f"Callback data: {callback.data}")
+    logger.info("Callback data: %s", callback.data)
     try:
-        doctor_id = int(callback.data.split(":")[1])
+        doctor_id = parse_cb(callback.data)[0]
         data = await state.get_data()
         hospital_id = data.get("hospital_id")
 
@@ -296,35 +363,34 @@ async def select_doctor(callback: CallbackQuery, state: FSMContext):
             await callback.answer("Ошибка: не выбрана больница", show_alert=True)
             return
 
-        # Get specialty and hospital names for display
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-
         # Get doctor details to extract names
-        doctor = await data_service.get_doctor(doctor_id, hospital_id)
+        doctor = await get_doctor_cached(data_service, doctor_id, hospital_id)
         if not doctor:
             await callback.answer("Врач не найден", show_alert=True)
             return
 
         # Store doctor and hospital info in state for navigation and reviews
-        await state.update_data(doctor_id=doctor_id, hospital_id=hospital_id)
+        # hospital_id is already stored, so write back the data we just read
+        data["doctor_id"] = doctor_id
+        await state.set_data(data)
         
         # Show doctor card
         await show_doctor_card(
             callback=callback,
             doctor_id=doctor_id,
             hospital_id=hospital_id,
+            data_service=data_service,
+            doctor=doctor,
         )
 
-    except Exception as e:
-        logger.error(f"Error selecting doctor: {e}, callback data: {callback.data}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error selecting doctor: %s, callback data: %s", e, callback.data)
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_doctors")
-async def back_to_doctors(callback: CallbackQuery, state: FSMContext):
+async def back_to_doctors(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Go back to doctor selection."""
     logger.info("Back to doctors list")
     try:
@@ -338,25 +404,25 @@ async def back_to_doctors(callback: CallbackQuery, state: FSMContext):
             logger.info("Redirecting to AI hospitals list")
             # Import here to avoid circular dependency
             from app.handlers.ai_search import back_to_ai_hospitals
-            await back_to_ai_hospitals(callback, state)
+            await back_to_ai_hospitals(callback, state, data_service)
             return
 
         if not hospital_id or not specialty_id:
             await callback.answer("Ошибка: данные поиска потеряны", show_alert=True)
-            await start_search(callback, state)
-            return
-
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
+            await start_search(callback, state, data_service)
             return
 
-        # Get doctors for this hospital and specialty
-        doctors_data = await data_service.get_doctors(
-            hospital_id=hospital_id, specialty_id=specialty_id, limit=100
-        )
-        doctors = doctors_data.get("items", [])
+        # Reuse the list shown on the forward step when available
+        doctors = data.get("doctors_snapshot")
+        if not doctors:
+            # Get doctors for this hospital and specialty
+            doctors_data = await cached_call(
+                ("doc", hospital_id, specialty_id),
+                lambda: data_service.get_doctors(
+                    hospital_id=hospital_id, specialty_id=specialty_id, limit=100
+                ),
+            )
+            doctors = doctors_data.get("items", [])
 
         if not doctors:
             await callback.answer("Врачи не найдены", show_alert=True)
@@ -373,28 +439,23 @@ async def back_to_doctors(callback: CallbackQuery, state: FSMContext):
             back_callback="back_to_hospitals",
         )
 
-        # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
-        
-        await callback.message.answer(
+        await safe_message_transition(
+            callback,
             "🔍 <b>Поиск врача</b>\n\nШаг 3 из 3: Выберите врача",
             reply_markup=keyboard,
-            parse_mode="HTML",
         )
 
         await state.set_state(SearchStates.selecting_doctor)
         await callback.answer()
 
-    except Exception as e:
-        logger.error(f"Error going back to doctors: {e}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error going back to doctors: %s", e)
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_hospitals")
-async def back_to_hospitals(callback: CallbackQuery, state: FSMContext):
+async def back_to_hospitals(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Go back to hospital selection."""
     logger.info("Back to hospitals list")
     try:
@@ -407,25 +468,23 @@ async def back_to_hospitals(callback: CallbackQuery, state: FSMContext):
             logger.info("Redirecting to AI hospitals list")
             # Import here to avoid circular dependency
             from app.handlers.ai_search import back_to_ai_hospitals
-            await back_to_ai_hospitals(callback, state)
+            await back_to_ai_hospitals(callback, state, data_service)
             return
 
         if not specialty_id:
             await callback.answer("Ошибка: специальность не выбрана", show_alert=True)
-            await start_search(callback, state)
+            await start_search(callback, state, data_service)
             return
 
-        # Get data service
-        data_service = await get_data_service(callback)
-        if not data_service:
-            await callback.answer("Ошибка сервиса данных", show_alert=True)
-            return
-
-        # Get hospitals for this specialty
-        hospitals_data = await data_service.get_hospitals(
-            specialty_id=specialty_id, limit=100
-        )
-        hospitals = hospitals_data.get("items", [])
+        # Reuse the list shown on the forward step when available
+        hospitals = data.get("hospitals_snapshot")
+        if not hospitals:
+            # Get hospitals for this specialty
+            hospitals_data = await cached_call(
+                ("hosp", specialty_id),
+                lambda: data_service.get_hospitals(specialty_id=specialty_id, limit=100),
+            )
+            hospitals = hospitals_data.get("items", [])
 
         if not hospitals:
             await callback.answer("Больницы не найдены", show_alert=True)
@@ -442,55 +501,52 @@ async def back_to_hospitals(callback: CallbackQuery, state: FSMContext):
             back_callback="back_to_specialties",
         )
 
-        # Delete previous message and send new one
-        try:
-            await callback.message.delete()
-        except Exception:
-            pass
-        
-        await callback.message.answer(
+        await safe_message_transition(
+            callback,
             "🔍 <b>Поиск врача</b>\n\nШаг 2 из 3: Выберите медицинское учреждение",
             reply_markup=keyboard,
-            parse_mode="HTML",
         )
 
         await state.set_state(SearchStates.selecting_hospital)
         await callback.answer()
 
-    except Exception as e:
-        logger.error(f"Error going back to hospitals: {e}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error going back to hospitals: %s", e)
         await callback.answer(Messages.ERROR_LOADING_DATA, show_alert=True)
 
 
-@router.callback_query(F.data == "back_to_specialties")
-async def back_to_specialties(callback: CallbackQuery, state: FSMContext):
+async def back_to_specialties(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Go back to specialty selection."""
     logger.info("Back to specialties list")
-    await start_search(callback, state)
+    await start_search(callback, state, data_service)
 
 
-@router.callback_query(F.data == "new_search")
-async def new_search(callback: CallbackQuery, state: FSMContext):
+async def new_search(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Start new search."""
     logger.info("Starting new search")
     await state.clear()
-    await start_search(callback, state)
+    await start_search(callback, state, data_service)
 
 
 
-@router.callback_query(F.data.startswith("back_to_doctor:"))
-async def back_to_doctor(callback: CallbackQuery, state: FSMContext):
+async def back_to_doctor(
+    callback: CallbackQuery, state: FSMContext, data_service: StandaloneDataService
+):
     """Go back to doctor details from reviews."""
-    doctor_id = int(callback.data.split(":")[1])
+    doctor_id = parse_cb(callback.data)[0]
     
-    logger.info(f"Back to doctor {doctor_id}")
+    logger.info("Back to doctor %s", doctor_id)
     try:
         data = await state.get_data()
         hospital_id = data.get("hospital_id")
 
         if not hospital_id:
             await callback.answer("Ошибка: данные о больнице потеряны", show_alert=True)
-            await start_search(callback, state)
+            await start_search(callback, state, data_service)
             return
 
         # Show doctor card
@@ -498,8 +554,9 @@ async def back_to_doctor(callback: CallbackQuery, state: FSMContext):
             callback=callback,
             doctor_id=doctor_id,
             hospital_id=hospital_id,
+            data_service=data_service,
         )
 
-    except Exception as e:
-        logger.error(f"Error going back to doctor: {e}")
+    except BACKEND_ERRORS as e:
+        logger.error("Error going back to doctor: %s", e)
         await callback.answer("Ошибка при загрузке данных", show_alert=True)
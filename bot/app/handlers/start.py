@@ -1,11 +1,11 @@
 """Start and help command handlers."""
 
-from aiogram import Router, F
+from aiogram import Router
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command, CommandStart
 from aiogram.fsm.context import FSMContext
 
-from app.keyboards.inline import build_start_keyboard
+from app.keyboards.inline import build_help_keyboard, build_start_keyboard
 from app.utils import safe_message_transition
 from app.constants import Messages
 
@@ -19,11 +19,10 @@ async def cmd_start(message: Message, state: FSMContext):
     await state.clear()
 
     await message.answer(
-        Messages.WELCOME, reply_markup=build_start_keyboard(), parse_mode="HTML"
+        Messages.WELCOME, reply_markup=build_start_keyboard()
     )
 
 
-@router.callback_query(F.data == "start")
 async def callback_start(callback: CallbackQuery, state: FSMContext):
     """Handle start button."""
     await state.clear()
@@ -37,14 +36,11 @@ async def callback_start(callback: CallbackQuery, state: FSMContext):
 @router.message(Command("help"))
 async def cmd_help(message: Message):
     """Handle /help command."""
-    await message.answer(Messages.HELP, parse_mode="HTML")
+    await message.answer(Messages.HELP)
 
 
-@router.callback_query(F.data == "help")
 async def callback_help(callback: CallbackQuery):
     """Handle help button."""
-    from app.keyboards.inline import build_help_keyboard
-
     await safe_message_transition(
         callback, Messages.HELP, reply_markup=build_help_keyboard()
     )
@@ -64,7 +60,6 @@ async def cmd_cancel(message: Message, state: FSMContext):
     await message.answer(Messages.CANCEL_COMMAND, reply_markup=build_start_keyboard())
 
 
-@router.callback_query(F.data == "cancel")
 async def callback_cancel(callback: CallbackQuery, state: FSMContext):
     """Handle cancel button."""
     await state.clear()
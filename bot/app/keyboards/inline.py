@@ -2,10 +2,22 @@
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from app.constants import ButtonLabels
 
+# Buttons without per-call data are created once and shared between keyboards
+_HOME_BTN = InlineKeyboardButton(text=ButtonLabels.HOME, callback_data="start")
+_NEW_SEARCH_BTN = InlineKeyboardButton(text=ButtonLabels.NEW_SEARCH, callback_data="new_search")
+_BACK_TO_LIST_BTN = InlineKeyboardButton(
+    text=ButtonLabels.BACK_TO_LIST, callback_data="back_to_doctors"
+)
+_CANCEL_BTN = InlineKeyboardButton(text=ButtonLabels.CANCEL, callback_data="cancel")
+_HELP_BTN = InlineKeyboardButton(text=ButtonLabels.HELP, callback_data="help")
+_FIND_DOCTOR_BTN = InlineKeyboardButton(text="🔍 Найти врача", callback_data="find_doctor")
+_AI_SEARCH_BTN = InlineKeyboardButton(text="🤖 ИИ Ассистент", callback_data="ai_search")
+
 
 def build_paginated_keyboard(
     items: List[dict],
@@ -18,6 +30,9 @@ def build_paginated_keyboard(
 ) -> InlineKeyboardMarkup:
     """Build paginated inline keyboard.
 
+    Identical inputs return the same cached markup instance, so callers
+    must not mutate the result.
+
     Args:
         items: List of items to display
         callback_prefix: Prefix for callback data
@@ -30,13 +45,26 @@ def build_paginated_keyboard(
     Returns:
         InlineKeyboardMarkup
     """
+    buttons = tuple((item[id_key], item[name_key]) for item in items)
+    return _build_paginated_keyboard_cached(
+        buttons, callback_prefix, page, total_pages, back_callback
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_paginated_keyboard_cached(
+    buttons: Tuple[Tuple[int, str], ...],
+    callback_prefix: str,
+    page: int,
+    total_pages: int,
+    back_callback: Optional[str],
+) -> InlineKeyboardMarkup:
+    """Build paginated inline keyboard from hashable (id, name) pairs."""
     builder = InlineKeyboardBuilder()
 
     # Add item buttons
-    for item in items:
-        builder.button(
-            text=item[name_key], callback_data=f"{callback_prefix}:{item[id_key]}"
-        )
+    for item_id, name in buttons:
+        builder.button(text=name, callback_data=f"{callback_prefix}:{item_id}")
 
     # Adjust to one button per row
     builder.adjust(1)
@@ -69,9 +97,7 @@ def build_paginated_keyboard(
         nav_buttons.append(
             InlineKeyboardButton(text=ButtonLabels.BACK, callback_data=back_callback)
         )
-    nav_buttons.append(
-        InlineKeyboardButton(text=ButtonLabels.HOME, callback_data="start")
-    )
+    nav_buttons.append(_HOME_BTN)
     builder.row(*nav_buttons)
 
     return builder.as_markup()
@@ -82,6 +108,9 @@ def build_doctor_actions_keyboard(
 ) -> InlineKeyboardMarkup:
     """Build keyboard with doctor actions.
 
+    Coordinates are rounded to 5 decimals (about 1 m) so the cached
+    markup can be shared; callers must not mutate the result.
+
     Args:
         doctor_id: Doctor ID
         hospital_id: Hospital ID
@@ -91,6 +120,16 @@ def build_doctor_actions_keyboard(
     Returns:
         InlineKeyboardMarkup
     """
+    return _build_doctor_actions_keyboard_cached(
+        doctor_id, hospital_id, round(lon, 5), round(lat, 5)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _build_doctor_actions_keyboard_cached(
+    doctor_id: int, hospital_id: int, lon: float, lat: float
+) -> InlineKeyboardMarkup:
+    """Build doctor actions keyboard for rounded coordinates."""
     # Yandex Maps URL
     maps_url = f"https://yandex.ru/maps/?ll={lon},{lat}&z=16&pt={lon},{lat},comma"
 
@@ -108,20 +147,14 @@ def build_doctor_actions_keyboard(
         ),
     )
 
-    builder.row(
-        InlineKeyboardButton(
-            text=ButtonLabels.BACK_TO_LIST, callback_data="back_to_doctors"
-        )
-    )
+    builder.row(_BACK_TO_LIST_BTN)
 
-    builder.row(
-        InlineKeyboardButton(text=ButtonLabels.NEW_SEARCH, callback_data="new_search"),
-        InlineKeyboardButton(text=ButtonLabels.HOME, callback_data="start"),
-    )
+    builder.row(_NEW_SEARCH_BTN, _HOME_BTN)
 
     return builder.as_markup()
 
 
+@lru_cache(maxsize=4096)
 def build_reviews_keyboard(doctor_id: int, hospital_id: int = 0) -> InlineKeyboardMarkup:
     """Build keyboard for reviews page.
 
@@ -130,7 +163,7 @@ def build_reviews_keyboard(doctor_id: int, hospital_id: int = 0) -> InlineKeyboa
         hospital_id: Hospital ID (optional, defaults to 0)
 
     Returns:
-        InlineKeyboardMarkup
+        Cached InlineKeyboardMarkup instance, must not be mutated
     """
     builder = InlineKeyboardBuilder()
 
@@ -145,13 +178,13 @@ def build_reviews_keyboard(doctor_id: int, hospital_id: int = 0) -> InlineKeyboa
             text=ButtonLabels.BACK_TO_DOCTOR,
             callback_data=f"back_to_doctor:{doctor_id}",
         ),
-        InlineKeyboardButton(text=ButtonLabels.HOME, callback_data="start"),
+        _HOME_BTN,
     )
 
     return builder.as_markup()
 
 
-def build_start_keyboard() -> InlineKeyboardMarkup:
+def _build_start_keyboard_impl() -> InlineKeyboardMarkup:
     """Build start menu keyboard.
 
     Returns:
@@ -159,20 +192,27 @@ def build_start_keyboard() -> InlineKeyboardMarkup:
     """
     builder = InlineKeyboardBuilder()
 
-    builder.row(
-        InlineKeyboardButton(text="🔍 Найти врача", callback_data="find_doctor")
-    )
-    
-    builder.row(
-        InlineKeyboardButton(text="🤖 ИИ Ассистент", callback_data="ai_search")
-    )
-
-    builder.row(InlineKeyboardButton(text=ButtonLabels.HELP, callback_data="help"))
+    builder.row(_FIND_DOCTOR_BTN)
+    builder.row(_AI_SEARCH_BTN)
+    builder.row(_HELP_BTN)
 
     return builder.as_markup()
 
 
-def build_help_keyboard() -> InlineKeyboardMarkup:
+# Start menu never changes, so it is built once at import
+_START_KEYBOARD = _build_start_keyboard_impl()
+
+
+def build_start_keyboard() -> InlineKeyboardMarkup:
+    """Get start menu keyboard.
+
+    Returns:
+        Shared InlineKeyboardMarkup instance, must not be mutated
+    """
+    return _START_KEYBOARD
+
+
+def _build_help_keyboard_impl() -> InlineKeyboardMarkup:
     """Build help menu keyboard.
 
     Returns:
@@ -180,11 +220,24 @@ def build_help_keyboard() -> InlineKeyboardMarkup:
     """
     builder = InlineKeyboardBuilder()
 
-    builder.row(InlineKeyboardButton(text=ButtonLabels.HOME, callback_data="start"))
+    builder.row(_HOME_BTN)
 
     return builder.as_markup()
 
 
+_HELP_KEYBOARD = _build_help_keyboard_impl()
+
+
+def build_help_keyboard() -> InlineKeyboardMarkup:
+    """Get help menu keyboard.
+
+    Returns:
+        Shared InlineKeyboardMarkup instance, must not be mutated
+    """
+    return _HELP_KEYBOARD
+
+
+@lru_cache(maxsize=4096)
 def build_review_success_keyboard(doctor_id: int) -> InlineKeyboardMarkup:
     """Build keyboard after successful review submission.
 
@@ -192,7 +245,7 @@ def build_review_success_keyboard(doctor_id: int) -> InlineKeyboardMarkup:
         doctor_id: Doctor ID to return to
 
     Returns:
-        InlineKeyboardMarkup
+        Cached InlineKeyboardMarkup instance, must not be mutated
     """
     builder = InlineKeyboardBuilder()
 
@@ -203,15 +256,12 @@ def build_review_success_keyboard(doctor_id: int) -> InlineKeyboardMarkup:
         )
     )
 
-    builder.row(
-        InlineKeyboardButton(text=ButtonLabels.NEW_SEARCH, callback_data="new_search"),
-        InlineKeyboardButton(text=ButtonLabels.HOME, callback_data="start"),
-    )
+    builder.row(_NEW_SEARCH_BTN, _HOME_BTN)
 
     return builder.as_markup()
 
 
-def build_cancel_keyboard() -> InlineKeyboardMarkup:
+def _build_cancel_keyboard_impl() -> InlineKeyboardMarkup:
     """Build cancel keyboard.
 
     Returns:
@@ -219,6 +269,18 @@ def build_cancel_keyboard() -> InlineKeyboardMarkup:
     """
     builder = InlineKeyboardBuilder()
 
-    builder.row(InlineKeyboardButton(text=ButtonLabels.CANCEL, callback_data="cancel"))
+    builder.row(_CANCEL_BTN)
 
     return builder.as_markup()
+
+
+_CANCEL_KEYBOARD = _build_cancel_keyboard_impl()
+
+
+def build_cancel_keyboard() -> InlineKeyboardMarkup:
+    """Get cancel keyboard.
+
+    Returns:
+        Shared InlineKeyboardMarkup instance, must not be mutated
+    """
+    return _CANCEL_KEYBOARD
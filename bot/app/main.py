@@ -2,84 +2,143 @@
 
 import asyncio
 import logging
+import logging.handlers
+import queue
 import sys
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.fsm.storage.memory import MemoryStorage, SimpleEventIsolation
 from app.services.standalone_service import StandaloneDataService
 from app.services.ai_assistant import AIAssistant
-from app.handlers import start, standalone_search, standalone_review, ai_search
+from app.middlewares.throttling import SendRateLimitMiddleware
+from app.handlers import callbacks, errors, start, standalone_review, ai_search
 from app.standalone_config import StandaloneBotConfig
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stdout,
-)
-
 logger = logging.getLogger(__name__)
 
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """Configure logging so that stdout writes happen off the event loop.
+
+    Records are put on a queue by the root logger and written to stdout by
+    a listener thread.
+
+    Returns:
+        Started queue listener, stop it on shutdown to flush the queue
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
 async def main():
     """Main bot function."""
     # Initialize config
     config = StandaloneBotConfig()
     
     # Initialize bot and dispatcher
-    bot = Bot(token=config.TELEGRAM_TOKEN)
+    bot = Bot(
+        token=config.TELEGRAM_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    bot.session.middleware(SendRateLimitMiddleware())
     storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    # Updates run as concurrent tasks; isolation keeps each chat's own
+    # updates (one FSM storage key) from running at the same time
+    dp = Dispatcher(storage=storage, events_isolation=SimpleEventIsolation())
     
-    # Initialize data service and attach to bot
-    bot._data_service = StandaloneDataService(
+    # Initialize data service
+    data_service = StandaloneDataService(
         db_path=config.DATABASE_PATH, 
-        yandex_api_key=config.YANDEX_API_KEY
+        yandex_api_key=config.YANDEX_API_KEY,
+        map_cache_dir=config.MAP_CACHE_DIR,
     )
+    await data_service.connect()
     
     # Initialize AI assistant if credentials provided
+    ai_assistant = None
     if config.GIGACHAT_CREDENTIALS:
         try:
-            bot._ai_assistant = AIAssistant(credentials=config.GIGACHAT_CREDENTIALS)
-            await bot._ai_assistant.initialize()
+            ai_assistant = AIAssistant(
+                credentials=config.GIGACHAT_CREDENTIALS,
+                max_concurrency=config.GIGACHAT_MAX_CONCURRENCY,
+            )
+            await ai_assistant.initialize()
             logger.info("AI Assistant: Enabled")
         except Exception as e:
             logger.warning(f"Failed to initialize AI Assistant: {e}")
             logger.info("AI Assistant: Disabled")
-            bot._ai_assistant = None
+            ai_assistant = None
     else:
-        bot._ai_assistant = None
         logger.info("AI Assistant: Disabled (no credentials)")
 
-    # Register routers
+    # Services are injected into handlers as keyword arguments
+    dp["data_service"] = data_service
+    dp["ai_assistant"] = ai_assistant
+
+    # Errors not handled inside handlers
+    dp.errors.register(errors.handle_error)
+
+    # Register routers; callback queries are dispatched by prefix
+    dp.include_router(callbacks.router)
     dp.include_router(start.router)
-    dp.include_router(standalone_search.router)
     dp.include_router(standalone_review.router)
     
     # Register AI search router if AI is enabled
-    if bot._ai_assistant:
+    if ai_assistant:
         dp.include_router(ai_search.router)
 
+    # Reviews are written in batches by a background task
+    standalone_review.start_review_flusher(data_service)
+
     logger.info("Starting bot...")
     logger.info(f"Database: {config.DATABASE_PATH}")
     logger.info(f"Yandex API: {'Enabled' if config.YANDEX_API_KEY else 'Disabled'}")
 
     try:
-        await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+        await dp.start_polling(
+            bot,
+            allowed_updates=dp.resolve_used_update_types(),
+            handle_as_tasks=True,
+        )
     except Exception as e:
         logger.error(f"Error: {e}")
     finally:
         # Close services
-        if hasattr(bot, '_data_service'):
-            await bot._data_service.close()
-        if hasattr(bot, '_ai_assistant') and bot._ai_assistant:
-            await bot._ai_assistant.close()
+        await standalone_review.stop_review_flusher(data_service)
+        await data_service.close()
+        if ai_assistant:
+            await ai_assistant.close()
         await bot.session.close()
         logger.info("Bot stopped")
 
 
+def install_uvloop() -> None:
+    """Use uvloop event loop when available (not supported on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+    logger.info("Event loop: uvloop")
+
+
 if __name__ == "__main__":
+    log_listener = setup_logging()
+    install_uvloop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
+    finally:
+        log_listener.stop()
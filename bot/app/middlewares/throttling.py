@@ -0,0 +1,31 @@
+"""Bot session middleware that throttles outgoing messages."""
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from app.utils.ratelimit import send_limiter
+
+# API methods that count towards Telegram's per-bot message limit
+THROTTLED_PREFIXES = ("send", "edit", "copy", "forward")
+
+
+class SendRateLimitMiddleware(BaseRequestMiddleware):
+    """Queue message sends and edits through the shared token bucket.
+
+    Other calls such as answerCallbackQuery or getUpdates pass through.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if method.__api_method__.startswith(THROTTLED_PREFIXES):
+            await send_limiter.acquire()
+        return await make_request(bot, method)
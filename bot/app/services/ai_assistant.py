@@ -1,51 +1,313 @@
 """AI Assistant service using GigaChat."""
 
+import asyncio
 import logging
 import re
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Any, Optional, Tuple
 from gigachat import GigaChat
 from gigachat.models import Chat, Messages, MessagesRole
 
+from app.utils.cache import TTLCache
+
+try:
+    import ahocorasick
+except ImportError:  # optional, specialty matching falls back to substring scans
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# AI filtering results are reused for identical queries over identical hospitals
+FILTER_CACHE_TTL = 120
+FILTER_CACHE_SIZE = 1024
+
+# Specialty answers for first-turn queries are reused for identical queries
+SEARCH_CACHE_TTL = 3600
+SEARCH_CACHE_SIZE = 1024
+
+# Upper bound for simultaneous GigaChat requests
+AI_MAX_CONCURRENCY = 16
+
+# Specialty catalogs rarely change, a handful of rendered variants is plenty
+SPECIALTIES_PROMPT_CACHE_SIZE = 8
+
+
+# System prompts are split into invariant instructions (module constants below)
+# and a per-request tail with hospitals or specialties, so the static part
+# forms a stable prefix across requests
+_FILTER_PROMPT_PREFIX = """Ты - помощник по фильтрации адресов в городе Калуга.
+
+Твоя задача:
+1. Определить ВСЕ адреса в КАЛУГЕ, которые соответствуют запросу пользователя
+2. Вернуть ТОЛЬКО номера ВСЕХ подходящих больниц через запятую
+
+КРИТИЧЕСКИ ВАЖНО:
+- Рассматривай ТОЛЬКО адреса, где указан город КАЛУГА
+- ИГНОРИРУЙ все адреса в других городах (Москва, Обнинск, Тула и т.д.)
+- Если в адресе нет слова "КАЛУГА" - НЕ включай эту больницу
+
+Фильтрация по районам Калуги:
+- "в центре" / "центр города" / "центр Калуги" = улицы: Ленина, Кирова, Театральная, Октябрьская, Площадь, Баумана, Суворова
+- "Московский район" = адреса с указанием "Московский" или улицы в этом районе
+- Включай ВСЕ больницы в Калуге, которые подходят под запрос
+
+Примеры:
+- Запрос "в центре Калуги" → ВСЕ больницы с адресами "КАЛУГА" + центральные улицы: 1,3,5,7,12,15
+- Запрос "улица Ленина" → ВСЕ больницы "КАЛУГА, ул. Ленина": 2,8,14
+- Запрос "Московский район" → ВСЕ больницы "КАЛУГА, Московский": 4,9,11,16
+
+ИСКЛЮЧАЙ:
+- Адреса без слова "КАЛУГА"
+- Адреса в других городах (даже если улица подходит)
+
+Ответь ТОЛЬКО номерами через запятую, например: 1,3,5,7,12,15"""
+
+_SEARCH_PROMPT_PREFIX = """Ты - умный помощник по поиску врачей в медицинских учреждениях Калуги.
+
+Твои возможности:
+1. Понимать запросы о специальностях врачей
+2. Распознавать адреса, районы и улицы Калуги
+3. Учитывать предпочтения пользователя (близко к дому, хорошие отзывы)
+4. Предлагать альтернативы, если точной специальности нет
+
+Примеры запросов:
+- "Нужен окулист рядом с улицей Ленина"
+- "Ищу хорошего стоматолога в центре"
+- "Детский врач недалеко от дома"
+
+Твоя задача:
+1. Определить специальность из списка ниже
+2. Извлечь информацию о местоположении (адрес, район, улица)
+3. Понять предпочтения (близко, хорошие отзывы, опытный)
+4. Ответить дружелюбно и помочь с поиском
+
+Формат ответа:
+- Подтверди, что понял запрос
+- Укажи найденную специальность
+- Если есть адрес - упомяни его
+- Предложи помощь в выборе
+
+Отвечай кратко и по делу. Используй эмодзи для дружелюбности."""
+
+_RECOMMEND_PROMPT_PREFIX = """Ты - умный помощник по выбору врача в Калуге.
+
+Твоя задача:
+1. Учесть предпочтения пользователя (местоположение, качество)
+2. Порекомендовать наиболее подходящего врача
+3. Объяснить, почему именно этот врач подходит
+4. Упомянуть адрес и удобство расположения
+
+Отвечай кратко, дружелюбно и по делу. Используй эмодзи."""
+
+
+def _normalize_query(user_query: str) -> str:
+    """Normalize query for use as a cache key."""
+    return " ".join(user_query.lower().split())
+
+
+def _catalog_key(specialties: List[Dict[str, Any]]) -> int:
+    """Hash specialties catalog for use as a cache key."""
+    return hash(tuple((s['id'], s['name']) for s in specialties))
+
+
+# Keyword tables used on every AI query, built once at import
+_LOCATION_KEYWORDS = (
+    'улица', 'ул.', 'проспект', 'пр.', 'переулок', 'пер.',
+    'район', 'рядом', 'около', 'возле', 'недалеко', 'близко',
+    'центр', 'центре', 'окраина'
+)
+# Districts of Kaluga, later entries win when several match
+_DISTRICTS = (
+    'ленинский', 'московский', 'октябрьский',
+    'центр', 'центральный'
+)
+_CENTER_STREETS = ('центр', 'ленина', 'кирова', 'театральная', 'площадь', 'октябрьская')
+_STOPWORDS = frozenset((
+    'улица', 'улице', 'проспект', 'переулок', 'район', 'рядом', 'около',
+    'возле', 'недалеко', 'близко', 'нужен', 'ищу', 'найти'
+))
+_SPECIALTY_SYNONYMS = {
+    'окулист': 'офтальмолог',
+    'глазной': 'офтальмолог',
+    'зубной': 'стоматолог',
+    'дантист': 'стоматолог',
+    'детский врач': 'педиатр',
+    'лор': 'оториноларинголог',
+    'ухо-горло-нос': 'оториноларинголог',
+    'ухогорлонос': 'оториноларинголог',
+    'невролог': 'невролог',
+    'психиатр': 'психиатр',
+    'хирург': 'хирург',
+    'терапевт': 'терапевт'
+}
+
+
+def _substring_re(words) -> "re.Pattern[str]":
+    """Compile a regex matching any of the words anywhere in the text."""
+    return re.compile("|".join(map(re.escape, words)))
+
+
+_LOCATION_RE = _substring_re(_LOCATION_KEYWORDS)
+_CENTER_RE = _substring_re(_CENTER_STREETS)
+_QUALITY_RE = _substring_re(('хороший', 'лучший', 'опытный', 'проверенный'))
+_NEARBY_RE = _substring_re(('близко', 'рядом', 'недалеко', 'около'))
+_REVIEWS_RE = _substring_re(('отзыв', 'рейтинг', 'рекомендуют'))
+_KALUGA_RE = re.compile(r"калуга|kaluga", re.IGNORECASE)
+_NUM_RE = re.compile(r'\d+')
+# A new line starting with a word: the answer moved on from the number list
+_PROSE_LINE_RE = re.compile(r'\n[^\S\n]*[^\W\d_]')
+
+
+@dataclass(frozen=True)
+class LocationInfo:
+    """Location details parsed from a user query."""
+    
+    __slots__ = ('has_location', 'address', 'district', 'near_center', 'preferences')
+    
+    has_location: bool
+    address: Optional[str]
+    district: Optional[str]
+    near_center: bool
+    preferences: FrozenSet[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary, e.g. for storing in FSM data."""
+        return {
+            'has_location': self.has_location,
+            'address': self.address,
+            'district': self.district,
+            'near_center': self.near_center,
+            'preferences': sorted(self.preferences),
+        }
+
+
+NO_LOCATION = LocationInfo(
+    has_location=False, address=None, district=None, near_center=False, preferences=frozenset()
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_location_info(user_query: str) -> LocationInfo:
+    """Parse location information from user query.
+    
+    Pure function of the query string, so results are memoized.
+    
+    Args:
+        user_query: User's query text
+        
+    Returns:
+        Location info (address, district, preferences)
+    """
+    query_lower = user_query.lower()
+    
+    district = None
+    for name in _DISTRICTS:
+        if name in query_lower:
+            district = name
+    near_center = 'центр' in query_lower
+    
+    # Extract preferences
+    preferences = frozenset(
+        name
+        for name, pattern in (
+            ('quality', _QUALITY_RE),
+            ('nearby', _NEARBY_RE),
+            ('reviews', _REVIEWS_RE),
+        )
+        if pattern.search(query_lower)
+    )
+    
+    return LocationInfo(
+        has_location=bool(district or near_center or _LOCATION_RE.search(query_lower)),
+        address=None,
+        district=district,
+        near_center=near_center,
+        preferences=preferences,
+    )
+
+
+# GigaChat clients shared by assistants with the same credentials, so their
+# OAuth token and keep-alive connections are reused. A client is closed when
+# the last assistant using it is closed
+_shared_clients: Dict[str, GigaChat] = {}
+_client_refs: Dict[str, int] = {}
+_clients_lock: Optional[asyncio.Lock] = None
+
 
 class AIAssistant:
     """AI Assistant for doctor search using GigaChat."""
     
-    def __init__(self, credentials: str):
+    def __init__(self, credentials: str, max_concurrency: int = AI_MAX_CONCURRENCY):
         """Initialize AI Assistant.
         
         Args:
             credentials: GigaChat API credentials
+            max_concurrency: Maximum number of simultaneous GigaChat requests
         """
         self.credentials = credentials
         self.client = None
+        self.max_concurrency = max_concurrency
+        # Caps in-flight GigaChat requests; extra callers wait their turn
+        self._sem = asyncio.Semaphore(max_concurrency)
+        # (normalized query, hospital IDs) -> IDs of hospitals selected by AI
+        self._filter_cache = TTLCache(ttl=FILTER_CACHE_TTL, maxsize=FILTER_CACHE_SIZE)
+        # (normalized query, catalog hash) -> (AI response, specialty ID)
+        self._search_cache = TTLCache(ttl=SEARCH_CACHE_TTL, maxsize=SEARCH_CACHE_SIZE)
+        # Specialties catalog hash -> rendered prompt fragment
+        self._specialties_prompt_cache: Dict[int, str] = {}
+        # Specialties catalog hash -> (lowered names with IDs, synonym -> ID, automaton)
+        self._specialty_index_cache: Dict[int, Tuple[tuple, Dict[str, int], Any]] = {}
+        # Last specialties list seen and its catalog hash
+        self._last_catalog: Optional[Tuple[List[Dict[str, Any]], int]] = None
         
     async def initialize(self):
-        """Initialize GigaChat client."""
+        """Initialize GigaChat client, sharing one client per credentials."""
+        global _clients_lock
+        if self.client is not None:
+            return
+        if _clients_lock is None:
+            _clients_lock = asyncio.Lock()
+        async with _clients_lock:
+            client = _shared_clients.get(self.credentials)
+            if client is None:
+                client = self._create_client()
+                # Fetch the OAuth token now so the first user query does not
+                # pay for the TLS handshake and token round-trip
+                try:
+                    await client.aget_token()
+                except Exception as e:
+                    logger.warning(f"GigaChat token prefetch failed: {e}")
+                _shared_clients[self.credentials] = client
+            _client_refs[self.credentials] = _client_refs.get(self.credentials, 0) + 1
+            self.client = client
+    
+    def _create_client(self) -> GigaChat:
+        """Create GigaChat client."""
         try:
             # Try different initialization approaches
             # Approach 1: Direct credentials with scope and timeout
             try:
-                self.client = GigaChat(
+                client = GigaChat(
                     credentials=self.credentials,
                     verify_ssl_certs=False,
                     scope="GIGACHAT_API_PERS",
-                    timeout=30.0  # 30 seconds timeout
+                    timeout=30.0,  # 30 seconds timeout
+                    max_connections=self.max_concurrency
                 )
                 logger.info("GigaChat client initialized successfully with scope")
-                return
+                return client
             except Exception as e1:
                 logger.warning(f"Failed with scope parameter: {e1}")
             
             # Approach 2: Without scope
             try:
-                self.client = GigaChat(
+                client = GigaChat(
                     credentials=self.credentials,
                     verify_ssl_certs=False
                 )
                 logger.info("GigaChat client initialized successfully without scope")
-                return
+                return client
             except Exception as e2:
                 logger.warning(f"Failed without scope: {e2}")
                 raise e2
@@ -54,6 +316,18 @@ class AIAssistant:
             logger.error(f"Failed to initialize GigaChat: {e}")
             raise
     
+    async def _achat(self, messages: List[Messages]) -> Any:
+        """Send chat request to GigaChat within the concurrency limit.
+        
+        Args:
+            messages: Prompt messages
+            
+        Returns:
+            GigaChat completion response
+        """
+        async with self._sem:
+            return await self.client.achat(Chat(messages=messages))
+    
     async def filter_hospitals_by_location(
         self,
         user_query: str,
@@ -74,94 +348,169 @@ class AIAssistant:
         # Extract location info
         location_info = self._extract_location_info(user_query)
         
-        if not location_info.get('has_location'):
+        if not location_info.has_location:
             return hospitals
         
-        # Build list of addresses for AI
-        addresses_list = "\n".join([
-            f"{i+1}. {h.get('name', 'Неизвестно')}: {h.get('address', 'Адрес не указан')}"
-            for i, h in enumerate(hospitals[:50])  # Limit to 50 for AI processing
-        ])
+        key = (_normalize_query(user_query), frozenset(h['id'] for h in hospitals))
         
-        system_prompt = f"""Ты - помощник по фильтрации адресов в городе Калуга.
-
-Список больниц с адресами:
-{addresses_list}
-
-Запрос пользователя: "{user_query}"
-
-Твоя задача:
-1. Определить ВСЕ адреса в КАЛУГЕ, которые соответствуют запросу пользователя
-2. Вернуть ТОЛЬКО номера ВСЕХ подходящих больниц через запятую
-
-КРИТИЧЕСКИ ВАЖНО:
-- Рассматривай ТОЛЬКО адреса, где указан город КАЛУГА
-- ИГНОРИРУЙ все адреса в других городах (Москва, Обнинск, Тула и т.д.)
-- Если в адресе нет слова "КАЛУГА" - НЕ включай эту больницу
-
-Фильтрация по районам Калуги:
-- "в центре" / "центр города" / "центр Калуги" = улицы: Ленина, Кирова, Театральная, Октябрьская, Площадь, Баумана, Суворова
-- "Московский район" = адреса с указанием "Московский" или улицы в этом районе
-- Включай ВСЕ больницы в Калуге, которые подходят под запрос
-
-Примеры:
-- Запрос "в центре Калуги" → ВСЕ больницы с адресами "КАЛУГА" + центральные улицы: 1,3,5,7,12,15
-- Запрос "улица Ленина" → ВСЕ больницы "КАЛУГА, ул. Ленина": 2,8,14
-- Запрос "Московский район" → ВСЕ больницы "КАЛУГА, Московский": 4,9,11,16
-
-ИСКЛЮЧАЙ:
-- Адреса без слова "КАЛУГА"
-- Адреса в других городах (даже если улица подходит)
-
-Ответь ТОЛЬКО номерами через запятую, например: 1,3,5,7,12,15"""
+        try:
+            selected_ids = await self._filter_cache.get_or_load(
+                key, lambda: self._select_hospital_ids(user_query, hospitals)
+            )
+        except Exception as e:
+            logger.error(f"Error in AI address filtering: {e}")
+            # Fallback to simple matching
+            matches = self._address_matcher(user_query)
+            return [h for h in hospitals if matches(h.get('address', ''))]
+        
+        hospitals_by_id = {h['id']: h for h in hospitals}
+        return [hospitals_by_id[i] for i in selected_ids if i in hospitals_by_id]
+    
+    async def _select_hospital_ids(
+        self,
+        user_query: str,
+        hospitals: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Ask AI which hospitals match the location query.
+        
+        Args:
+            user_query: User's location query
+            hospitals: List of hospitals with addresses
+            
+        Returns:
+            IDs of matching hospitals
+        """
+        # Ask once per distinct (name, address), answers apply to every copy
+        ids_by_entry: Dict[Tuple[Any, Any], List[int]] = {}
+        candidates = []
+        for h in hospitals:
+            entry = (h.get('name'), h.get('address'))
+            if entry not in ids_by_entry:
+                ids_by_entry[entry] = []
+                candidates.append(h)
+            ids_by_entry[entry].append(h['id'])
+        
+        # The prompt excludes other cities anyway, so do not send them
+        in_kaluga = [h for h in candidates if _KALUGA_RE.search(h.get('address') or '')]
+        if in_kaluga:
+            candidates = in_kaluga
+        candidates = candidates[:50]  # Limit to 50 for AI processing
+        
+        def ids_of(selected: List[Dict[str, Any]]) -> List[int]:
+            return [i for h in selected for i in ids_by_entry[(h.get('name'), h.get('address'))]]
+        
+        # Invariant instructions go first so the upstream prefix cache can reuse them
+        addresses_list = "\n".join(
+            f"{i}. {h.get('name', 'Неизвестно')}: {h.get('address', 'Адрес не указан')}"
+            for i, h in enumerate(candidates, 1)
+        )
+        system_prompt = (
+            f"{_FILTER_PROMPT_PREFIX}\n\n"
+            f"Список больниц с адресами:\n{addresses_list}\n\n"
+            f'Запрос пользователя: "{user_query}"'
+        )
 
         messages = [
             Messages(role=MessagesRole.SYSTEM, content=system_prompt),
             Messages(role=MessagesRole.USER, content=f"Какие больницы подходят под запрос: {user_query}?")
         ]
         
-        try:
-            if not self.client:
-                await self.initialize()
-            
-            response = self.client.chat(Chat(messages=messages))
-            ai_response = response.choices[0].message.content.strip()
-            
-            logger.info(f"AI address filtering response: {ai_response}")
-            
-            # Parse numbers from response
-            numbers = re.findall(r'\d+', ai_response)
-            selected_indices = [int(n) - 1 for n in numbers if int(n) <= len(hospitals)]
+        if not self.client:
+            await self.initialize()
+        
+        numbers = await self._stream_hospital_numbers(messages, len(candidates))
+        
+        if not numbers:
+            logger.warning("AI didn't return valid hospital numbers")
+            return [h['id'] for h in hospitals]
+        
+        filtered = [candidates[n - 1] for n in numbers]
+        
+        # Log selected addresses for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            for h in filtered:
+                logger.debug("AI selected: %s - Address: %s", h.get('name'), h.get('address', 'NO ADDRESS'))
+        
+        # Additional filter: ensure addresses contain "Калуга" or "КАЛУГА"
+        filtered_kaluga = [h for h in filtered if _KALUGA_RE.search(h.get('address') or '')]
+        
+        if filtered_kaluga:
+            logger.info("AI filtered %s hospitals in Kaluga from %s", len(filtered_kaluga), len(hospitals))
+            return ids_of(filtered_kaluga)
+        
+        logger.warning(
+            "AI filtered %s hospitals but none in Kaluga, sample addresses: %s",
+            len(filtered),
+            [h.get('address', 'NO ADDR')[:50] for h in filtered[:3]],
+        )
+        # Return filtered anyway - AI knows better
+        return ids_of(filtered)
+    
+    async def _stream_hospital_numbers(self, messages: List[Messages], count: int) -> List[int]:
+        """Stream AI answer and collect hospital numbers as they arrive.
+        
+        The stream is closed early once every offered hospital was named or
+        a line of prose follows the numbers, since nothing useful comes after that.
+        
+        Args:
+            messages: Prompt messages
+            count: Number of hospitals offered to AI, numbered from 1
             
-            if selected_indices:
-                filtered = [hospitals[i] for i in selected_indices if i < len(hospitals)]
-                
-                # Log selected addresses for debugging
-                for h in filtered:
-                    logger.info(f"AI selected: {h.get('name')} - Address: {h.get('address', 'NO ADDRESS')}")
-                
-                # Additional filter: ensure addresses contain "Калуга" or "КАЛУГА"
-                filtered_kaluga = [
-                    h for h in filtered 
-                    if h.get('address') and ('калуга' in h.get('address', '').lower() or 'kaluga' in h.get('address', '').lower())
-                ]
-                
-                if filtered_kaluga:
-                    logger.info(f"AI filtered {len(filtered_kaluga)} hospitals in Kaluga from {len(hospitals)}")
-                    return filtered_kaluga
+        Returns:
+            Distinct hospital numbers in answer order
+        """
+        numbers: List[int] = []
+        text = ""
+        pos = 0
+        async with self._sem:
+            stream = self.client.astream(Chat(messages=messages))
+            try:
+                async for chunk in stream:
+                    text += chunk.choices[0].delta.content or ""
+                    pos, done = self._collect_numbers(text, pos, count, numbers, final=False)
+                    if done:
+                        break
                 else:
-                    logger.warning(f"AI filtered {len(filtered)} hospitals but none in Kaluga")
-                    logger.warning(f"Sample addresses: {[h.get('address', 'NO ADDR')[:50] for h in filtered[:3]]}")
-                    # Return filtered anyway - AI knows better
-                    return filtered
-            else:
-                logger.warning("AI didn't return valid hospital numbers")
-                return hospitals
-                
-        except Exception as e:
-            logger.error(f"Error in AI address filtering: {e}")
-            # Fallback to simple matching
-            return [h for h in hospitals if self.match_address(h.get('address', ''), user_query)]
+                    self._collect_numbers(text, pos, count, numbers, final=True)
+            finally:
+                await stream.aclose()
+        
+        logger.info("AI address filtering response: %s", text.strip())
+        return numbers
+    
+    @staticmethod
+    def _collect_numbers(
+        text: str, pos: int, count: int, numbers: List[int], final: bool
+    ) -> Tuple[int, bool]:
+        """Append valid hospital numbers found in text after pos.
+        
+        Args:
+            text: AI answer received so far
+            pos: Offset where unparsed text starts
+            count: Largest valid hospital number
+            numbers: Collected numbers, extended in place
+            final: Whether the answer is complete
+            
+        Returns:
+            New offset and whether the rest of the answer can be skipped
+        """
+        for match in _NUM_RE.finditer(text, pos):
+            # Words inside the list ("1, 3 и 5", "1 (ул. Ленина)") are skipped,
+            # only a new line of prose after the numbers ends it
+            if numbers and _PROSE_LINE_RE.search(text, pos, match.start()):
+                return pos, True
+            if not final and match.end() == len(text):
+                break  # the number may continue in the next chunk
+            number = int(match.group())
+            if 1 <= number <= count and number not in numbers:
+                numbers.append(number)
+                if len(numbers) == count:
+                    return match.end(), True
+            pos = match.end()
+        else:
+            if numbers and _PROSE_LINE_RE.search(text, pos):
+                return pos, True
+        return pos, False
     
     async def search_doctors(
         self, 
@@ -179,42 +528,28 @@ class AIAssistant:
         Returns:
             Dictionary with search results and AI response
         """
+        # A plain "найти терапевта" needs no AI: the specialty is named
+        # directly and there is no location or preference to interpret
+        if not conversation_history:
+            location_info = self._extract_location_info(user_query)
+            if not location_info.has_location and not location_info.preferences:
+                specialty_id = self._extract_specialty_id(user_query, specialties)
+                if specialty_id is not None:
+                    specialty_name = next(s['name'] for s in specialties if s['id'] == specialty_id)
+                    return {
+                        "response": f"🔍 Ищу врачей по специальности <b>{specialty_name}</b>...",
+                        "specialty_id": specialty_id,
+                        "specialty_name": specialty_name,
+                        "needs_clarification": False,
+                        "location_info": location_info
+                    }
+        
         if not self.client:
             await self.initialize()
         
-        # Prepare specialty list for AI
-        specialty_list = "\n".join([f"- {s['name']} (ID: {s['id']})" for s in specialties])
-        
-        # Build system prompt with enhanced capabilities
-        system_prompt = f"""Ты - умный помощник по поиску врачей в медицинских учреждениях Калуги.
-
-Доступные специальности:
-{specialty_list}
-
-Твои возможности:
-1. Понимать запросы о специальностях врачей
-2. Распознавать адреса, районы и улицы Калуги
-3. Учитывать предпочтения пользователя (близко к дому, хорошие отзывы)
-4. Предлагать альтернативы, если точной специальности нет
-
-Примеры запросов:
-- "Нужен окулист рядом с улицей Ленина"
-- "Ищу хорошего стоматолога в центре"
-- "Детский врач недалеко от дома"
-
-Твоя задача:
-1. Определить специальность из списка выше
-2. Извлечь информацию о местоположении (адрес, район, улица)
-3. Понять предпочтения (близко, хорошие отзывы, опытный)
-4. Ответить дружелюбно и помочь с поиском
-
-Формат ответа:
-- Подтверди, что понял запрос
-- Укажи найденную специальность
-- Если есть адрес - упомяни его
-- Предложи помощь в выборе
-
-Отвечай кратко и по делу. Используй эмодзи для дружелюбности."""
+        # Static instructions first, then the specialty list
+        specialty_list = self._get_specialty_list(specialties)
+        system_prompt = f"{_SEARCH_PROMPT_PREFIX}\n\nДоступные специальности:\n{specialty_list}"
 
         # Build messages
         messages = [
@@ -234,30 +569,31 @@ class AIAssistant:
             # Extract location info from user query
             location_info = self._extract_location_info(user_query)
             
-            # Get AI response with timeout handling
-            logger.info(f"Sending request to GigaChat for query: {user_query[:50]}...")
-            response = self.client.chat(Chat(messages=messages))
-            ai_response = response.choices[0].message.content
-            logger.info(f"Received response from GigaChat: {ai_response[:50]}...")
-            
-            # Extract specialty from response
-            specialty_id = self._extract_specialty_id(ai_response, specialties)
+            # Get AI response and extract specialty from it. Answers without
+            # history depend only on the query, so they are reused
+            if conversation_history:
+                ai_response, specialty_id = await self._ask_specialty(messages, specialties)
+            else:
+                key = (_normalize_query(user_query), self._get_catalog_key(specialties))
+                ai_response, specialty_id = await self._search_cache.get_or_load(
+                    key, lambda: self._ask_specialty(messages, specialties)
+                )
             
             # Enhance response with location info
-            if location_info['has_location'] and specialty_id:
+            if location_info.has_location and specialty_id:
                 ai_response += "\n\n✅ <b>Применяю фильтр по местоположению:</b>"
                 
-                if location_info['district']:
-                    ai_response += f"\n📍 Район: {location_info['district'].title()}"
-                elif location_info['near_center']:
+                if location_info.district:
+                    ai_response += f"\n📍 Район: {location_info.district.title()}"
+                elif location_info.near_center:
                     ai_response += f"\n📍 Центр города"
                 else:
                     ai_response += f"\n📍 По указанному адресу"
                 
-                if 'nearby' in location_info['preferences']:
+                if 'nearby' in location_info.preferences:
                     ai_response += "\n🚶 Приоритет: близость к дому"
                 
-                if 'quality' in location_info['preferences']:
+                if 'quality' in location_info.preferences:
                     ai_response += "\n⭐ Приоритет: качество и репутация"
                 
                 ai_response += "\n\nПоказываю только подходящие варианты! 🎯"
@@ -277,10 +613,106 @@ class AIAssistant:
                 "specialty_id": None,
                 "specialty_name": None,
                 "needs_clarification": True,
-                "location_info": {},
+                "location_info": NO_LOCATION,
                 "error": str(e)
             }
     
+    async def _ask_specialty(
+        self,
+        messages: List[Messages],
+        specialties: List[Dict[str, Any]]
+    ) -> Tuple[str, Optional[int]]:
+        """Ask AI about the query and extract specialty from its answer.
+        
+        Args:
+            messages: Prompt messages ending with the user query
+            specialties: List of available specialties
+            
+        Returns:
+            Tuple of AI response text and specialty ID (None if not found)
+        """
+        logger.info(f"Sending request to GigaChat for query: {messages[-1].content[:50]}...")
+        response = await self._achat(messages)
+        ai_response = response.choices[0].message.content
+        logger.info(f"Received response from GigaChat: {ai_response[:50]}...")
+        return ai_response, self._extract_specialty_id(ai_response, specialties)
+    
+    def _get_catalog_key(self, specialties: List[Dict[str, Any]]) -> int:
+        """Get catalog hash, skipping the rehash for the list seen last time.
+        
+        Handlers pass the same cached specialties list until its cache
+        expires, so an identity check is enough. The list is kept
+        referenced, so its id cannot be reused by another object.
+        
+        Args:
+            specialties: List of available specialties
+            
+        Returns:
+            Catalog hash used as a cache key
+        """
+        last = self._last_catalog
+        if last is not None and last[0] is specialties:
+            return last[1]
+        key = _catalog_key(specialties)
+        self._last_catalog = (specialties, key)
+        return key
+    
+    def _get_specialty_list(self, specialties: List[Dict[str, Any]]) -> str:
+        """Render specialties as a prompt fragment, reusing earlier renders.
+        
+        Args:
+            specialties: List of available specialties
+            
+        Returns:
+            Specialty list for the system prompt
+        """
+        key = self._get_catalog_key(specialties)
+        specialty_list = self._specialties_prompt_cache.get(key)
+        if specialty_list is None:
+            if len(self._specialties_prompt_cache) >= SPECIALTIES_PROMPT_CACHE_SIZE:
+                self._specialties_prompt_cache.clear()
+            specialty_list = "\n".join(f"- {s['name']} (ID: {s['id']})" for s in specialties)
+            self._specialties_prompt_cache[key] = specialty_list
+        return specialty_list
+    
+    def _get_specialty_index(
+        self, specialties: List[Dict[str, Any]]
+    ) -> Tuple[tuple, Dict[str, int], Any]:
+        """Prepare lowered specialty names and resolved synonyms once per catalog.
+        
+        When pyahocorasick is installed, names and synonyms are also compiled
+        into an automaton whose values are (priority, specialty ID), where
+        priority follows the order used by the substring scan.
+        
+        Args:
+            specialties: List of available specialties
+            
+        Returns:
+            Tuple of ((lowered name, ID), ...), synonym -> specialty ID and
+            the automaton (None without pyahocorasick)
+        """
+        key = self._get_catalog_key(specialties)
+        index = self._specialty_index_cache.get(key)
+        if index is None:
+            if len(self._specialty_index_cache) >= SPECIALTIES_PROMPT_CACHE_SIZE:
+                self._specialty_index_cache.clear()
+            names = tuple((s['name'].lower(), s['id']) for s in specialties)
+            synonyms = {}
+            for synonym, target in _SPECIALTY_SYNONYMS.items():
+                specialty_id = next((sid for name, sid in names if target in name), None)
+                if specialty_id is not None:
+                    synonyms[synonym] = specialty_id
+            automaton = None
+            if ahocorasick is not None:
+                automaton = ahocorasick.Automaton()
+                for priority, (word, specialty_id) in enumerate((*names, *synonyms.items())):
+                    if word and word not in automaton:
+                        automaton.add_word(word, (priority, specialty_id))
+                automaton.make_automaton()
+            index = (names, synonyms, automaton)
+            self._specialty_index_cache[key] = index
+        return index
+    
     def _extract_specialty_id(self, ai_response: str, specialties: List[Dict[str, Any]]) -> Optional[int]:
         """Extract specialty ID from AI response.
         
@@ -291,35 +723,24 @@ class AIAssistant:
         Returns:
             Specialty ID if found, None otherwise
         """
+        names, synonyms, automaton = self._get_specialty_index(specialties)
+        
         # Look for specialty mentions in response
         response_lower = ai_response.lower()
         
-        for specialty in specialties:
-            specialty_name_lower = specialty['name'].lower()
-            if specialty_name_lower in response_lower:
-                return specialty['id']
+        if automaton is not None and len(automaton):
+            # Single pass over the response, earliest name wins over synonyms
+            hits = [value for _, value in automaton.iter(response_lower)]
+            return min(hits)[1] if hits else None
         
-        # Check for common synonyms
-        synonyms = {
-            'окулист': 'офтальмолог',
-            'глазной': 'офтальмолог',
-            'зубной': 'стоматолог',
-            'дантист': 'стоматолог',
-            'детский врач': 'педиатр',
-            'лор': 'оториноларинголог',
-            'ухо-горло-нос': 'оториноларинголог',
-            'ухогорлонос': 'оториноларинголог',
-            'невролог': 'невролог',
-            'психиатр': 'психиатр',
-            'хирург': 'хирург',
-            'терапевт': 'терапевт'
-        }
+        for name, specialty_id in names:
+            if name in response_lower:
+                return specialty_id
         
-        for synonym, specialty_name in synonyms.items():
+        # Check for common synonyms
+        for synonym, specialty_id in synonyms.items():
             if synonym in response_lower:
-                for specialty in specialties:
-                    if specialty_name.lower() in specialty['name'].lower():
-                        return specialty['id']
+                return specialty_id
         
         return None
     
@@ -333,104 +754,53 @@ class AIAssistant:
         Returns:
             True if address matches query
         """
-        address_lower = hospital_address.lower()
-        query_lower = location_query.lower()
-        
-        # Extract location info
-        location_info = self._extract_location_info(location_query)
+        return self._address_matcher(location_query)(hospital_address)
+    
+    def _address_matcher(self, location_query: str) -> Callable[[str], bool]:
+        """Build address predicate for a query, parsing the query only once.
         
-        # Check district
-        if location_info.get('district'):
-            if location_info['district'] in address_lower:
+        Args:
+            location_query: User's location query
+            
+        Returns:
+            Function telling whether a hospital address matches the query
+        """
+        location_info = _parse_location_info(location_query.strip())
+        district = location_info.district
+        near_center = location_info.near_center
+        # Significant words (longer than 3 characters) such as street names
+        words = tuple(
+            word for word in location_query.lower().split()
+            if len(word) > 3 and word not in _STOPWORDS
+        )
+        
+        def matches(hospital_address: str) -> bool:
+            address_lower = hospital_address.lower()
+            if district and district in address_lower:
                 return True
-        
-        # Check center
-        if location_info.get('near_center'):
-            center_keywords = ['центр', 'ленина', 'кирова', 'театральная', 'площадь', 'октябрьская']
-            if any(keyword in address_lower for keyword in center_keywords):
+            if near_center and _CENTER_RE.search(address_lower):
                 return True
+            return any(word in address_lower for word in words)
         
-        # Check for street names and numbers
-        # Extract words longer than 3 characters
-        query_words = [w for w in query_lower.split() if len(w) > 3 and w not in [
-            'улица', 'улице', 'проспект', 'переулок', 'район', 'рядом', 'около', 
-            'возле', 'недалеко', 'близко', 'нужен', 'ищу', 'найти'
-        ]]
-        
-        # Check if any significant word from query is in address
-        matches = sum(1 for word in query_words if word in address_lower)
-        
-        # If at least 1 significant word matches, consider it a match
-        return matches > 0
+        return matches
     
-    def _extract_location_info(self, user_query: str) -> Dict[str, Any]:
+    def _extract_location_info(self, user_query: str) -> LocationInfo:
         """Extract location information from user query.
         
         Args:
             user_query: User's query text
             
         Returns:
-            Dictionary with location info (address, district, preferences)
+            Location info (address, district, preferences)
         """
-        query_lower = user_query.lower()
-        
-        # Common location keywords
-        location_keywords = [
-            'улица', 'ул.', 'проспект', 'пр.', 'переулок', 'пер.',
-            'район', 'рядом', 'около', 'возле', 'недалеко', 'близко',
-            'центр', 'центре', 'окраина'
-        ]
-        
-        # Districts of Kaluga
-        districts = [
-            'ленинский', 'московский', 'октябрьский',
-            'центр', 'центральный'
-        ]
-        
-        # Extract location info
-        location_info = {
-            'has_location': False,
-            'address': None,
-            'district': None,
-            'near_center': False,
-            'preferences': []
-        }
-        
-        # Check for location keywords
-        for keyword in location_keywords:
-            if keyword in query_lower:
-                location_info['has_location'] = True
-                break
-        
-        # Check for districts
-        for district in districts:
-            if district in query_lower:
-                location_info['district'] = district
-                location_info['has_location'] = True
-        
-        # Check for center
-        if 'центр' in query_lower:
-            location_info['near_center'] = True
-            location_info['has_location'] = True
-        
-        # Extract preferences
-        if any(word in query_lower for word in ['хороший', 'лучший', 'опытный', 'проверенный']):
-            location_info['preferences'].append('quality')
-        
-        if any(word in query_lower for word in ['близко', 'рядом', 'недалеко', 'около']):
-            location_info['preferences'].append('nearby')
-        
-        if any(word in query_lower for word in ['отзыв', 'рейтинг', 'рекомендуют']):
-            location_info['preferences'].append('reviews')
-        
-        return location_info
+        return _parse_location_info(user_query.strip())
     
     async def get_recommendation(
         self,
         doctors: List[Dict[str, Any]],
         user_preferences: str,
         conversation_history: Optional[List[Dict[str, str]]] = None,
-        location_info: Optional[Dict[str, Any]] = None
+        location_info: Optional[LocationInfo] = None
     ) -> str:
         """Get AI recommendation for doctors.
         
@@ -447,38 +817,27 @@ class AIAssistant:
             await self.initialize()
         
         # Prepare doctors info with addresses
-        doctors_info = "\n\n".join([
+        doctors_info = "\n\n".join(
             f"Врач {i+1}: {d['name']}\n"
             f"Больница: {d.get('hospital_name', 'Не указана')}\n"
             f"Адрес: {d.get('address', 'Не указан')}\n"
             f"Специальность: {d.get('specialty_name', 'Не указана')}"
             for i, d in enumerate(doctors[:5])  # Top 5 doctors
-        ])
+        )
         
         location_context = ""
-        if location_info and location_info.get('has_location'):
+        if location_info and location_info.has_location:
             location_context = "\n\nПредпочтения пользователя по местоположению:\n"
-            if location_info.get('district'):
-                location_context += f"- Район: {location_info['district']}\n"
-            if location_info.get('near_center'):
+            if location_info.district:
+                location_context += f"- Район: {location_info.district}\n"
+            if location_info.near_center:
                 location_context += "- Предпочитает центр города\n"
-            if 'nearby' in location_info.get('preferences', []):
+            if 'nearby' in location_info.preferences:
                 location_context += "- Важна близость к дому\n"
-            if 'quality' in location_info.get('preferences', []):
+            if 'quality' in location_info.preferences:
                 location_context += "- Важно качество и репутация\n"
         
-        system_prompt = f"""Ты - умный помощник по выбору врача в Калуге.
-
-Доступные врачи:
-{doctors_info}{location_context}
-
-Твоя задача:
-1. Учесть предпочтения пользователя (местоположение, качество)
-2. Порекомендовать наиболее подходящего врача
-3. Объяснить, почему именно этот врач подходит
-4. Упомянуть адрес и удобство расположения
-
-Отвечай кратко, дружелюбно и по делу. Используй эмодзи."""
+        system_prompt = f"{_RECOMMEND_PROMPT_PREFIX}\n\nДоступные врачи:\n{doctors_info}{location_context}"
 
         messages = [
             Messages(role=MessagesRole.SYSTEM, content=system_prompt)
@@ -492,15 +851,21 @@ class AIAssistant:
         messages.append(Messages(role=MessagesRole.USER, content=user_preferences))
         
         try:
-            response = self.client.chat(Chat(messages=messages))
+            response = await self._achat(messages)
             return response.choices[0].message.content
         except Exception as e:
             logger.error(f"Error getting recommendation: {e}")
             return "Извините, не могу дать рекомендацию. Выберите врача из списка."
     
     async def close(self):
-        """Close GigaChat client."""
+        """Release the GigaChat client, closing it if no other assistant uses it."""
         if self.client:
-            # GigaChat client doesn't need explicit closing
-            self.client = None
+            client, self.client = self.client, None
+            if _shared_clients.get(self.credentials) is client:
+                _client_refs[self.credentials] -= 1
+                if _client_refs[self.credentials]:
+                    return
+                del _shared_clients[self.credentials]
+                del _client_refs[self.credentials]
+            await client.aclose()
             logger.info("GigaChat client closed")
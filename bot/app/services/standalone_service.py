@@ -1,299 +1,699 @@
 """Standalone bot data service - works without backend."""
 
+import asyncio
+import hashlib
+import json
 import sqlite3
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 import aiohttp
+import aiosqlite
 import logging
-from typing import Optional, List, Dict, Any
+import os
+from typing import Optional, Iterable, List, Dict, Any, Tuple, Callable, TypeVar
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional, the stdlib parser is used instead
+    orjson = None
+
+from app.utils.cache import SingleFlight, TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Parses bytes or str, orjson is several times faster on Yandex responses
+_json_loads: Callable[[Any], Any] = orjson.loads if orjson is not None else json.loads
+
+T = TypeVar("T")
+
+# Applied to the shared connection right after it is opened. WAL lets readers
+# run while a review is being written, busy_timeout waits out short locks,
+# wal_autocheckpoint folds the WAL back into the database every 1000 pages
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+# Specialties are served from memory, the table changes only on data imports
+SPECIALTIES_CACHE_TTL = 300.0
+
+# Tables created when the database file does not exist yet
+_BOOTSTRAP_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS specialties (
+       id INTEGER PRIMARY KEY,
+       name TEXT NOT NULL
+   )""",
+    """CREATE TABLE IF NOT EXISTS hospitals (
+       id INTEGER PRIMARY KEY,
+       name TEXT NOT NULL
+   )""",
+    """CREATE TABLE IF NOT EXISTS addresses (
+       id INTEGER PRIMARY KEY,
+       full_address TEXT NOT NULL
+   )""",
+    """CREATE TABLE IF NOT EXISTS hospital_addresses (
+       hospital_id INTEGER NOT NULL REFERENCES hospitals (id),
+       address_id INTEGER NOT NULL REFERENCES addresses (id),
+       PRIMARY KEY (hospital_id, address_id)
+   )""",
+    """CREATE TABLE IF NOT EXISTS doctors (
+       id INTEGER PRIMARY KEY,
+       full_name TEXT NOT NULL
+   )""",
+    """CREATE TABLE IF NOT EXISTS doctor_work_placements (
+       doctor_id INTEGER NOT NULL REFERENCES doctors (id),
+       hospital_id INTEGER NOT NULL REFERENCES hospitals (id),
+       specialty_id INTEGER NOT NULL REFERENCES specialties (id),
+       PRIMARY KEY (doctor_id, hospital_id, specialty_id)
+   )""",
+    """CREATE TABLE IF NOT EXISTS doctor_reviews (
+       id INTEGER PRIMARY KEY,
+       doctor_id INTEGER NOT NULL REFERENCES doctors (id),
+       hospital_id INTEGER NOT NULL REFERENCES hospitals (id),
+       user_name TEXT,
+       review_text TEXT NOT NULL,
+       created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+   )""",
+)
+
+# Geocoded coordinates are persisted, hospital addresses change very rarely
+GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60
+
+# Threads for file access, so disk I/O never runs on the event loop. SQLite
+# queries already run on the aiosqlite connection thread
+FILE_IO_WORKERS = 4
+
+# Zoom level of static maps, part of the map cache file key
+_MAP_ZOOM = "15"
+
+# (table, index name, columns) for the filters and sorts of the list queries
+_INDEXES = (
+    ("doctor_work_placements", "idx_dwp_hosp_spec", "hospital_id, specialty_id, doctor_id"),
+    ("doctor_work_placements", "idx_dwp_spec_hosp", "specialty_id, hospital_id"),
+    ("doctor_reviews", "idx_doctor_reviews_doctor_created", "doctor_id, created_at DESC"),
+)
+
+# SQL text is kept constant so sqlite3's per-connection statement cache, which
+# is keyed by the exact string, reuses prepared statements across calls.
+# Keyset variants of the list queries are formatted once at import
+_SQL_GET_SPECIALTIES = "SELECT id, name FROM specialties ORDER BY name, id"
+
+_HOSPITALS_BY_SPEC_TEMPLATE = """SELECT h.id, h.name, MIN(a.full_address) as full_address, COUNT(*) OVER ()
+   FROM hospitals h
+   JOIN doctor_work_placements dwp ON h.id = dwp.hospital_id
+   LEFT JOIN hospital_addresses ha ON h.id = ha.hospital_id
+   LEFT JOIN addresses a ON ha.address_id = a.id
+   WHERE dwp.specialty_id = ?{seek}
+   GROUP BY h.id, h.name
+   ORDER BY h.name, h.id LIMIT ?{offset}"""
+_SQL_GET_HOSPITALS_BY_SPEC = _HOSPITALS_BY_SPEC_TEMPLATE.format(seek="", offset=" OFFSET ?")
+_SQL_GET_HOSPITALS_BY_SPEC_AFTER = _HOSPITALS_BY_SPEC_TEMPLATE.format(
+    seek=" AND (h.name, h.id) > (?, ?)", offset=""
+)
+_SQL_COUNT_HOSPITALS_BY_SPEC = """SELECT COUNT(DISTINCT h.id)
+   FROM hospitals h
+   JOIN doctor_work_placements dwp ON h.id = dwp.hospital_id
+   WHERE dwp.specialty_id = ?"""
+
+_HOSPITALS_TEMPLATE = """SELECT h.id, h.name, MIN(a.full_address) as full_address, COUNT(*) OVER ()
+   FROM hospitals h
+   LEFT JOIN hospital_addresses ha ON h.id = ha.hospital_id
+   LEFT JOIN addresses a ON ha.address_id = a.id{seek}
+   GROUP BY h.id, h.name
+   ORDER BY h.name, h.id LIMIT ?{offset}"""
+_SQL_GET_HOSPITALS = _HOSPITALS_TEMPLATE.format(seek="", offset=" OFFSET ?")
+_SQL_GET_HOSPITALS_AFTER = _HOSPITALS_TEMPLATE.format(
+    seek="\n   WHERE (h.name, h.id) > (?, ?)", offset=""
+)
+_SQL_COUNT_HOSPITALS = "SELECT COUNT(*) FROM hospitals"
+
+_DOCTORS_PAGE_TEMPLATE = """SELECT d.id, d.full_name, h.name as hospital_name, s.name as specialty_name,
+          COUNT(*) OVER ()
+   FROM doctors d
+   JOIN doctor_work_placements dwp ON d.id = dwp.doctor_id
+   JOIN hospitals h ON dwp.hospital_id = h.id
+   JOIN specialties s ON dwp.specialty_id = s.id
+   WHERE dwp.hospital_id = ? AND dwp.specialty_id = ?{seek}
+   ORDER BY d.full_name, d.id LIMIT ?{offset}"""
+_SQL_GET_DOCTORS_PAGE = _DOCTORS_PAGE_TEMPLATE.format(seek="", offset=" OFFSET ?")
+_SQL_GET_DOCTORS_PAGE_AFTER = _DOCTORS_PAGE_TEMPLATE.format(
+    seek=" AND (d.full_name, d.id) > (?, ?)", offset=""
+)
+_SQL_COUNT_DOCTORS = """SELECT COUNT(*)
+   FROM doctor_work_placements
+   WHERE hospital_id = ? AND specialty_id = ?"""
+
+_SQL_GET_DOCTOR = """SELECT d.id, d.full_name, h.name as hospital_name, a.full_address, s.name as specialty_name
+   FROM doctors d
+   JOIN doctor_work_placements dwp ON d.id = dwp.doctor_id
+   JOIN hospitals h ON dwp.hospital_id = h.id
+   JOIN specialties s ON dwp.specialty_id = s.id
+   LEFT JOIN hospital_addresses ha ON h.id = ha.hospital_id
+   LEFT JOIN addresses a ON ha.address_id = a.id
+   WHERE d.id = ? AND dwp.hospital_id = ?
+   LIMIT 1"""
+
+# Full-text index over doctor names, kept in sync with doctors by triggers
+_FTS_SCHEMA = (
+    """CREATE VIRTUAL TABLE doctors_fts USING fts5(
+       full_name, content='doctors', content_rowid='id',
+       tokenize='unicode61 remove_diacritics 2'
+   )""",
+    """CREATE TRIGGER IF NOT EXISTS doctors_ai AFTER INSERT ON doctors BEGIN
+       INSERT INTO doctors_fts(rowid, full_name) VALUES (new.id, new.full_name);
+   END""",
+    """CREATE TRIGGER IF NOT EXISTS doctors_ad AFTER DELETE ON doctors BEGIN
+       INSERT INTO doctors_fts(doctors_fts, rowid, full_name) VALUES ('delete', old.id, old.full_name);
+   END""",
+    """CREATE TRIGGER IF NOT EXISTS doctors_au AFTER UPDATE ON doctors BEGIN
+       INSERT INTO doctors_fts(doctors_fts, rowid, full_name) VALUES ('delete', old.id, old.full_name);
+       INSERT INTO doctors_fts(rowid, full_name) VALUES (new.id, new.full_name);
+   END""",
+    "INSERT INTO doctors_fts(doctors_fts) VALUES ('rebuild')",
+)
+SEARCH_DOCTORS_LIMIT = 50
+
+_SQL_SEARCH_DOCTORS = """SELECT d.id, d.full_name, h.name as hospital_name, s.name as specialty_name, h.id as hospital_id
+   FROM doctors_fts f
+   JOIN doctors d ON d.id = f.rowid
+   JOIN doctor_work_placements dwp ON d.id = dwp.doctor_id
+   JOIN hospitals h ON dwp.hospital_id = h.id
+   JOIN specialties s ON dwp.specialty_id = s.id
+   WHERE doctors_fts MATCH ?
+   ORDER BY f.rank LIMIT ?"""
+# Used when the SQLite build has no FTS5
+_SQL_SEARCH_DOCTORS_LIKE = """SELECT d.id, d.full_name, h.name as hospital_name, s.name as specialty_name, h.id as hospital_id
+   FROM doctors d
+   JOIN doctor_work_placements dwp ON d.id = dwp.doctor_id
+   JOIN hospitals h ON dwp.hospital_id = h.id
+   JOIN specialties s ON dwp.specialty_id = s.id
+   WHERE d.full_name LIKE ?
+   ORDER BY d.full_name LIMIT ?"""
+
+_SQL_GET_REVIEWS_BY_DOCTOR = (
+    "SELECT id, user_name, review_text, created_at FROM doctor_reviews "
+    "WHERE doctor_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+_SQL_GET_REVIEWS = (
+    "SELECT id, user_name, review_text, created_at FROM doctor_reviews "
+    "ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+# IDs are passed as one JSON array, so the statement text does not depend on their number
+_SQL_COUNT_REVIEWS_BATCH = (
+    "SELECT doctor_id, COUNT(*) FROM doctor_reviews "
+    "WHERE doctor_id IN (SELECT value FROM json_each(?)) GROUP BY doctor_id"
+)
+_SQL_CREATE_REVIEW = (
+    "INSERT INTO doctor_reviews (doctor_id, hospital_id, user_name, review_text) "
+    "VALUES (:doctor_id, :hospital_id, :user_name, :review_text)"
+)
+
+_SQL_CREATE_GEOCODE_CACHE = """CREATE TABLE IF NOT EXISTS geocode_cache (
+       address TEXT PRIMARY KEY,
+       lon REAL NOT NULL,
+       lat REAL NOT NULL,
+       normalized TEXT,
+       cached_at INTEGER NOT NULL
+   )"""
+_SQL_GET_GEOCODE = (
+    "SELECT lon, lat, normalized FROM geocode_cache WHERE address = ? AND cached_at > ?"
+)
+_SQL_PUT_GEOCODE = (
+    "INSERT OR REPLACE INTO geocode_cache (address, lon, lat, normalized, cached_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def _read_file(path: Path) -> Optional[bytes]:
+    """Read a cached file, None if it does not exist or cannot be read."""
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write_file_atomic(path: Path, data: bytes) -> None:
+    """Write a file through a temporary name so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
 
 class StandaloneDataService:
     """Standalone data service that works directly with SQLite database."""
     
-    def __init__(self, db_path: str = "medical_data.db", yandex_api_key: str = ""):
+    def __init__(
+        self,
+        db_path: str = "medical_data.db",
+        yandex_api_key: str = "",
+        map_cache_dir: str = "map_cache",
+    ):
         """Initialize standalone data service.
         
         Args:
             db_path: Path to SQLite database
             yandex_api_key: Yandex Maps API key
+            map_cache_dir: Directory for downloaded static map images
         """
         self.db_path = db_path
         self.yandex_api_key = yandex_api_key
+        self.map_cache_dir = Path(map_cache_dir)
         self._session: Optional[aiohttp.ClientSession] = None
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        # Single connection shared by all handlers, queries run on its worker thread
+        self._db: Optional[aiosqlite.Connection] = None
+        # Full specialties list with (name, id) keys, see get_specialties()
+        self._specialties_cache = TTLCache(ttl=SPECIALTIES_CACHE_TTL)
+        # Writes share the connection's transaction, so they take turns
+        self._write_lock = asyncio.Lock()
+        # Identical concurrent Yandex requests share one HTTP call
+        self._geocode_flight = SingleFlight()
+        self._map_flight = SingleFlight()
+        # Set by connect() when doctors_fts is available for search_doctors()
+        self._fts_enabled = False
         
     async def get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session for Yandex API."""
         if self._session is None or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=30, connect=10)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            # Keep connections to Yandex alive and cache DNS between requests
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers={"Accept-Encoding": "gzip"},
+            )
         return self._session
     
+    async def _run_io(self, func: Callable[..., T], *args: Any) -> T:
+        """Run blocking file access on the service's I/O threads."""
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(
+                max_workers=FILE_IO_WORKERS, thread_name_prefix="data-service-io"
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, func, *args)
+    
     async def close(self) -> None:
-        """Close HTTP session."""
+        """Close HTTP session, database connection and I/O threads."""
         if self._session and not self._session.closed:
             await self._session.close()
+        if self._io_executor is not None:
+            # Started writes still finish, the threads are joined at interpreter exit
+            self._io_executor.shutdown(wait=False)
+            self._io_executor = None
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
     
-    def _get_db_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        db_file = Path(self.db_path)
-        if not db_file.exists():
+    async def connect(self) -> None:
+        """Open the shared database connection, called once at startup."""
+        if self._db is not None:
+            return
+        
+        db_exists = await self._run_io(Path(self.db_path).exists)
+        self._db = await aiosqlite.connect(self.db_path)
+        if self.db_path != ":memory:":
+            # journal_mode is persisted in the database file, the rest is per connection
+            await self._db.execute("PRAGMA journal_mode=WAL")
+            for pragma in _CONNECTION_PRAGMAS:
+                await self._db.execute(pragma)
+        if not db_exists:
             logger.warning(f"Database file {self.db_path} not found. Creating empty database.")
-            # Create empty database with basic structure
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS specialties (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL
-                )
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS hospitals (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    address TEXT,
-                    specialty_id INTEGER,
-                    FOREIGN KEY (specialty_id) REFERENCES specialties (id)
-                )
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS doctors (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    hospital_id INTEGER,
-                    specialty_id INTEGER,
-                    FOREIGN KEY (hospital_id) REFERENCES hospitals (id),
-                    FOREIGN KEY (specialty_id) REFERENCES specialties (id)
-                )
-            """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS reviews (
-                    id INTEGER PRIMARY KEY,
-                    doctor_id INTEGER,
-                    hospital_id INTEGER,
-                    user_name TEXT,
-                    review_text TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (doctor_id) REFERENCES doctors (id),
-                    FOREIGN KEY (hospital_id) REFERENCES hospitals (id)
-                )
-            """)
-            conn.commit()
-            return conn
+            # Create empty database with the tables the queries read
+            for sql in _BOOTSTRAP_SCHEMA:
+                await self._db.execute(sql)
+            await self._db.commit()
         
-        return sqlite3.connect(self.db_path)
+        await self._db.execute(_SQL_CREATE_GEOCODE_CACHE)
+        await self._db.commit()
+        await self._ensure_indexes()
+        await self._ensure_search_index()
     
-    async def get_specialties(self, skip: int = 0, limit: int = 10) -> Dict[str, Any]:
-        """Get list of specialties."""
-        conn = self._get_db_connection()
-        try:
-            cursor = conn.execute(
-                "SELECT id, name FROM specialties ORDER BY name LIMIT ? OFFSET ?",
-                (limit, skip)
-            )
-            specialties = [{"id": row[0], "name": row[1]} for row in cursor.fetchall()]
-            
-            # Get total count
-            cursor = conn.execute("SELECT COUNT(*) FROM specialties")
-            total = cursor.fetchone()[0]
-            
-            return {
-                "items": specialties,
-                "total": total,
-                "skip": skip,
-                "limit": limit
-            }
-        finally:
-            conn.close()
+    async def _ensure_indexes(self) -> None:
+        """Create missing indexes for existing tables and refresh planner statistics."""
+        rows = await self._fetchall("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')")
+        tables = {name for kind, name in rows if kind == "table"}
+        indexes = {name for kind, name in rows if kind == "index"}
+        
+        created = False
+        for table, index, columns in _INDEXES:
+            if table in tables and index not in indexes:
+                await self._db.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+                created = True
+        if created:
+            await self._db.execute("ANALYZE")
+            await self._db.commit()
+            logger.info("Database indexes created")
     
-    async def get_hospitals(self, specialty_id: Optional[int] = None, skip: int = 0, limit: int = 10) -> Dict[str, Any]:
-        """Get list of hospitals."""
-        conn = self._get_db_connection()
+    async def _ensure_search_index(self) -> None:
+        """Create and fill the doctors_fts name index if it is missing."""
+        rows = await self._fetchall(
+            "SELECT name FROM sqlite_master WHERE name IN ('doctors', 'doctors_fts')"
+        )
+        names = {row[0] for row in rows}
+        if "doctors_fts" in names:
+            self._fts_enabled = True
+            return
+        if "doctors" not in names:
+            return
+        
         try:
-            if specialty_id:
-                # Get hospitals that have doctors with this specialty
-                # Use GROUP BY to avoid duplicates when hospital has multiple addresses
-                cursor = conn.execute(
-                    """SELECT h.id, h.name, MIN(a.full_address) as full_address
-                       FROM hospitals h
-                       JOIN doctor_work_placements dwp ON h.id = dwp.hospital_id
-                       LEFT JOIN hospital_addresses ha ON h.id = ha.hospital_id
-                       LEFT JOIN addresses a ON ha.address_id = a.id
-                       WHERE dwp.specialty_id = ?
-                       GROUP BY h.id, h.name
-                       ORDER BY h.name LIMIT ? OFFSET ?""",
-                    (specialty_id, limit, skip)
-                )
-                cursor_count = conn.execute(
-                    """SELECT COUNT(DISTINCT h.id)
-                       FROM hospitals h
-                       JOIN doctor_work_placements dwp ON h.id = dwp.hospital_id
-                       WHERE dwp.specialty_id = ?""",
-                    (specialty_id,)
-                )
-            else:
-                cursor = conn.execute(
-                    """SELECT h.id, h.name, MIN(a.full_address) as full_address 
-                       FROM hospitals h
-                       LEFT JOIN hospital_addresses ha ON h.id = ha.hospital_id
-                       LEFT JOIN addresses a ON ha.address_id = a.id
-                       GROUP BY h.id, h.name
-                       ORDER BY h.name LIMIT ? OFFSET ?""",
-                    (limit, skip)
-                )
-                cursor_count = conn.execute("SELECT COUNT(*) FROM hospitals")
-            
-            hospitals = [{"id": row[0], "name": row[1], "address": row[2] if len(row) > 2 else None} for row in cursor.fetchall()]
-            total = cursor_count.fetchone()[0]
-            
-            return {
-                "items": hospitals,
-                "total": total,
-                "skip": skip,
-                "limit": limit
-            }
-        finally:
-            conn.close()
+            for sql in _FTS_SCHEMA:
+                await self._db.execute(sql)
+            await self._db.commit()
+        except sqlite3.OperationalError as e:
+            await self._db.rollback()
+            logger.warning("Full-text search unavailable, using LIKE for doctor search: %s", e)
+            return
+        self._fts_enabled = True
+        logger.info("Doctor name search index created")
     
-    async def get_doctors(self, hospital_id: int, specialty_id: int, skip: int = 0, limit: int = 10) -> Dict[str, Any]:
-        """Get list of doctors."""
-        conn = self._get_db_connection()
-        try:
-            cursor = conn.execute(
-                """SELECT d.id, d.full_name, h.name as hospital_name, s.name as specialty_name
-                   FROM doctors d
-                   JOIN doctor_work_placements dwp ON d.id = dwp.doctor_id
-                   JOIN hospitals h ON dwp.hospital_id = h.id
-                   JOIN specialties s ON dwp.specialty_id = s.id
-                   WHERE dwp.hospital_id = ? AND dwp.specialty_id = ?
-                   ORDER BY d.full_name LIMIT ? OFFSET ?""",
-                (hospital_id, specialty_id, limit, skip)
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Get the shared database connection, opening it on first use."""
+        if self._db is None:
+            await self.connect()
+        return self._db
+    
+    async def _fetchall(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        """Run query on the shared connection and fetch all rows."""
+        db = await self._get_db()
+        async with db.execute(sql, params) as cursor:
+            return await cursor.fetchall()
+    
+    async def _fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[sqlite3.Row]:
+        """Run query on the shared connection and fetch the first row."""
+        db = await self._get_db()
+        async with db.execute(sql, params) as cursor:
+            return await cursor.fetchone()
+    
+    async def _page_total(
+        self,
+        rows: List[sqlite3.Row],
+        skip: int,
+        after: Optional[Tuple[str, int]],
+        count_sql: str,
+        params: Iterable[Any] = ()
+    ) -> int:
+        """Get total row count for a page fetched with COUNT(*) OVER ().
+        
+        For OFFSET pages the total is read from the last column of the page,
+        only an empty page past the first one needs the separate count query.
+        Keyset pages filter rows before the window is computed, so their
+        total always comes from the count query.
+        """
+        if after is None:
+            if rows:
+                return rows[0][-1]
+            if not skip:
+                return 0
+        return (await self._fetchone(count_sql, params))[0]
+    
+    @staticmethod
+    def _page_params(
+        skip: int, limit: int, after: Optional[Tuple[str, int]]
+    ) -> Tuple[Any, ...]:
+        """Get trailing (seek and) LIMIT/OFFSET parameters of a list query.
+        
+        Raises:
+            ValueError: If both skip and after are given
+        """
+        if after is None:
+            return limit, skip
+        if skip:
+            raise ValueError("skip and after cannot be combined")
+        return (*after, limit)
+    
+    @staticmethod
+    def _next_after(rows: List[sqlite3.Row], limit: int) -> Optional[Tuple[str, int]]:
+        """Get keyset cursor (name, id) for the page after rows, None on the last page."""
+        if len(rows) < limit:
+            return None
+        return rows[-1][1], rows[-1][0]
+    
+    async def _load_specialties(self) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int]]]:
+        """Load all specialties ordered by (name, id) together with their sort keys."""
+        rows = await self._fetchall(_SQL_GET_SPECIALTIES)
+        return [{"id": row[0], "name": row[1]} for row in rows], [(row[1], row[0]) for row in rows]
+    
+    async def get_specialties(
+        self, skip: int = 0, limit: int = 10, after: Optional[Tuple[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Get list of specialties.
+        
+        The whole table is small and rarely changes, so it is kept in memory
+        for SPECIALTIES_CACHE_TTL seconds and pages are sliced from it.
+        Pages are either OFFSET-based (skip) or keyset-based (after, the
+        next_after value of the previous page), passing both is a ValueError.
+        """
+        self._page_params(skip, limit, after)
+        specialties, keys = await self._specialties_cache.get_or_load("all", self._load_specialties)
+        start = bisect_right(keys, tuple(after)) if after else skip
+        page = specialties[start:start + limit]
+        
+        return {
+            "items": [dict(item) for item in page],
+            "total": len(specialties),
+            "skip": skip,
+            "limit": limit,
+            "next_after": keys[start + limit - 1] if start + limit < len(keys) else None
+        }
+    
+    async def get_hospitals(
+        self,
+        specialty_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Get list of hospitals, paginated like get_specialties()."""
+        if specialty_id:
+            # Get hospitals that have doctors with this specialty
+            # Use GROUP BY to avoid duplicates when hospital has multiple addresses
+            rows = await self._fetchall(
+                _SQL_GET_HOSPITALS_BY_SPEC_AFTER if after else _SQL_GET_HOSPITALS_BY_SPEC,
+                (specialty_id, *self._page_params(skip, limit, after))
             )
-            doctors = [
-                {
-                    "id": row[0],
-                    "name": row[1],
-                    "hospital_name": row[2],
-                    "specialty_name": row[3]
-                }
-                for row in cursor.fetchall()
-            ]
-            
-            cursor = conn.execute(
-                """SELECT COUNT(*)
-                   FROM doctor_work_placements
-                   WHERE hospital_id = ? AND specialty_id = ?""",
-                (hospital_id, specialty_id)
+            total = await self._page_total(
+                rows, skip, after, _SQL_COUNT_HOSPITALS_BY_SPEC, (specialty_id,)
             )
-            total = cursor.fetchone()[0]
-            
-            return {
-                "items": doctors,
-                "total": total,
-                "skip": skip,
-                "limit": limit
+        else:
+            rows = await self._fetchall(
+                _SQL_GET_HOSPITALS_AFTER if after else _SQL_GET_HOSPITALS,
+                self._page_params(skip, limit, after)
+            )
+            total = await self._page_total(rows, skip, after, _SQL_COUNT_HOSPITALS)
+        
+        hospitals = [{"id": row[0], "name": row[1], "address": row[2]} for row in rows]
+        
+        return {
+            "items": hospitals,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_after": self._next_after(rows, limit)
+        }
+    
+    async def get_doctors(
+        self,
+        hospital_id: int,
+        specialty_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[Tuple[str, int]] = None
+    ) -> Dict[str, Any]:
+        """Get list of doctors, paginated like get_specialties()."""
+        rows = await self._fetchall(
+            _SQL_GET_DOCTORS_PAGE_AFTER if after else _SQL_GET_DOCTORS_PAGE,
+            (hospital_id, specialty_id, *self._page_params(skip, limit, after))
+        )
+        # Review counts for the whole page in one aggregated query
+        review_counts = await self.get_reviews_count_batch(row[0] for row in rows)
+        doctors = [
+            {
+                "id": row[0],
+                "name": row[1],
+                "hospital_name": row[2],
+                "specialty_name": row[3],
+                "reviews_count": review_counts.get(row[0], 0)
             }
-        finally:
-            conn.close()
+            for row in rows
+        ]
+        
+        total = await self._page_total(
+            rows, skip, after, _SQL_COUNT_DOCTORS, (hospital_id, specialty_id)
+        )
+        
+        return {
+            "items": doctors,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_after": self._next_after(rows, limit)
+        }
     
     async def get_doctor(self, doctor_id: int, hospital_id: int) -> Dict[str, Any]:
         """Get doctor details."""
-        conn = self._get_db_connection()
-        try:
-            cursor = conn.execute(
-                """SELECT d.id, d.full_name, h.name as hospital_name, a.full_address, s.name as specialty_name
-                   FROM doctors d
-                   JOIN doctor_work_placements dwp ON d.id = dwp.doctor_id
-                   JOIN hospitals h ON dwp.hospital_id = h.id
-                   JOIN specialties s ON dwp.specialty_id = s.id
-                   LEFT JOIN hospital_addresses ha ON h.id = ha.hospital_id
-                   LEFT JOIN addresses a ON ha.address_id = a.id
-                   WHERE d.id = ? AND dwp.hospital_id = ?
-                   LIMIT 1""",
-                (doctor_id, hospital_id)
+        row = await self._fetchone(
+            _SQL_GET_DOCTOR,
+            (doctor_id, hospital_id)
+        )
+        
+        if not row:
+            raise ValueError(f"Doctor {doctor_id} not found")
+        
+        return {
+            "id": row[0],
+            "name": row[1],
+            "hospital_name": row[2],
+            "address": row[3] if row[3] else "Адрес не указан",
+            "specialty_name": row[4]
+        }
+    
+    async def search_doctors(self, name: str) -> List[Dict[str, Any]]:
+        """Search doctors by name.
+        
+        Every word of the query matches the start of a word of the doctor's
+        name, best matches first.
+        """
+        words = name.split()
+        if not words:
+            return []
+        
+        await self._get_db()
+        if self._fts_enabled:
+            # Each word becomes a quoted prefix term, so FTS5 operators in user input are inert
+            query = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+            rows = await self._fetchall(_SQL_SEARCH_DOCTORS, (query, SEARCH_DOCTORS_LIMIT))
+        else:
+            rows = await self._fetchall(
+                _SQL_SEARCH_DOCTORS_LIKE, (f"%{name.strip()}%", SEARCH_DOCTORS_LIMIT)
             )
-            row = cursor.fetchone()
-            
-            if not row:
-                raise ValueError(f"Doctor {doctor_id} not found")
-            
-            return {
+        return [
+            {
                 "id": row[0],
                 "name": row[1],
                 "hospital_name": row[2],
-                "address": row[3] if row[3] else "Адрес не указан",
-                "specialty_name": row[4]
+                "specialty_name": row[3],
+                "hospital_id": row[4]
             }
-        finally:
-            conn.close()
-    
-    async def search_doctors(self, name: str) -> List[Dict[str, Any]]:
-        """Search doctors by name."""
-        conn = self._get_db_connection()
-        try:
-            cursor = conn.execute(
-                """SELECT d.id, d.name, h.name as hospital_name, s.name as specialty_name, h.id as hospital_id
-                   FROM doctors d
-                   JOIN hospitals h ON d.hospital_id = h.id
-                   JOIN specialties s ON d.specialty_id = s.id
-                   WHERE d.name LIKE ? ORDER BY d.name""",
-                (f"%{name}%",)
-            )
-            return [
-                {
-                    "id": row[0],
-                    "name": row[1],
-                    "hospital_name": row[2],
-                    "specialty_name": row[3],
-                    "hospital_id": row[4]
-                }
-                for row in cursor.fetchall()
-            ]
-        finally:
-            conn.close()
+            for row in rows
+        ]
     
     async def get_reviews(self, doctor_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """Get reviews."""
-        conn = self._get_db_connection()
-        try:
-            if doctor_id:
-                cursor = conn.execute(
-                    "SELECT id, user_name, review_text, created_at FROM doctor_reviews WHERE doctor_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
-                    (doctor_id, limit, skip)
-                )
-            else:
-                cursor = conn.execute(
-                    "SELECT id, user_name, review_text, created_at FROM doctor_reviews ORDER BY created_at DESC LIMIT ? OFFSET ?",
-                    (limit, skip)
-                )
-            
-            return [
-                {
-                    "id": row[0],
-                    "user_name": row[1],
-                    "review_text": row[2],
-                    "created_at": row[3]
-                }
-                for row in cursor.fetchall()
-            ]
-        finally:
-            conn.close()
+        if doctor_id:
+            rows = await self._fetchall(
+                _SQL_GET_REVIEWS_BY_DOCTOR,
+                (doctor_id, limit, skip)
+            )
+        else:
+            rows = await self._fetchall(
+                _SQL_GET_REVIEWS,
+                (limit, skip)
+            )
+        
+        return [
+            {
+                "id": row[0],
+                "user_name": row[1],
+                "review_text": row[2],
+                "created_at": row[3]
+            }
+            for row in rows
+        ]
+    
+    async def get_reviews_count_batch(self, doctor_ids: Iterable[int]) -> Dict[int, int]:
+        """Count reviews for several doctors with one query.
+        
+        Args:
+            doctor_ids: Doctor IDs
+        
+        Returns:
+            Mapping doctor_id -> number of reviews, doctors without reviews are omitted
+        """
+        ids = list(dict.fromkeys(doctor_ids))
+        if not ids:
+            return {}
+        rows = await self._fetchall(_SQL_COUNT_REVIEWS_BATCH, (json.dumps(ids),))
+        return {row[0]: row[1] for row in rows}
     
     async def create_review(self, doctor_id: int, hospital_id: int, user_name: str, review_text: str) -> Dict[str, Any]:
         """Create a review."""
-        conn = self._get_db_connection()
-        try:
-            cursor = conn.execute(
-                "INSERT INTO doctor_reviews (doctor_id, hospital_id, user_name, review_text) VALUES (?, ?, ?, ?)",
-                (doctor_id, hospital_id, user_name, review_text)
-            )
-            conn.commit()
-            return {"id": cursor.lastrowid, "message": "Review created successfully"}
-        finally:
-            conn.close()
+        db = await self._get_db()
+        async with self._write_lock:
+            async with db.execute(
+                _SQL_CREATE_REVIEW,
+                {
+                    "doctor_id": doctor_id,
+                    "hospital_id": hospital_id,
+                    "user_name": user_name,
+                    "review_text": review_text,
+                }
+            ) as cursor:
+                review_id = cursor.lastrowid
+            await db.commit()
+        return {"id": review_id, "message": "Review created successfully"}
+    
+    async def create_reviews_bulk(self, reviews: List[Dict[str, Any]]) -> int:
+        """Create several reviews in one transaction.
+        
+        Args:
+            reviews: Dicts with doctor_id, hospital_id, user_name and review_text
+        
+        Returns:
+            Number of inserted reviews
+        """
+        db = await self._get_db()
+        async with self._write_lock:
+            try:
+                await db.executemany(_SQL_CREATE_REVIEW, reviews)
+                await db.commit()
+            except sqlite3.Error:
+                await db.rollback()
+                raise
+        return len(reviews)
     
     async def geocode(self, address: str) -> Dict[str, Any]:
+        """Geocode address, answering from the geocode_cache table when possible.
+        
+        Results from Yandex API are stored for GEOCODE_CACHE_TTL seconds.
+        Concurrent calls for the same address share one lookup.
+        """
+        return await self._geocode_flight.run(address, lambda: self._geocode(address))
+    
+    async def _geocode(self, address: str) -> Dict[str, Any]:
+        """Geocode address through the cache table and Yandex API."""
+        row = await self._fetchone(_SQL_GET_GEOCODE, (address, int(time.time()) - GEOCODE_CACHE_TTL))
+        if row is not None:
+            return {"lon": row[0], "lat": row[1], "address": row[2]}
+        
+        result = await self._geocode_remote(address)
+        db = await self._get_db()
+        async with self._write_lock:
+            try:
+                await db.execute(
+                    _SQL_PUT_GEOCODE,
+                    (address, result["lon"], result["lat"], result["address"], int(time.time()))
+                )
+                await db.commit()
+            except sqlite3.Error as e:
+                # The coordinates are still good, only the next lookup pays for the request
+                await db.rollback()
+                logger.warning("Failed to cache geocoding result for %r: %s", address, e)
+        return result
+    
+    async def _geocode_remote(self, address: str) -> Dict[str, Any]:
         """Geocode address using Yandex API."""
         if not self.yandex_api_key:
             raise ValueError("Yandex API key is required for geocoding")
@@ -309,7 +709,7 @@ class StandaloneDataService:
         
         async with session.get(url, params=params) as resp:
             resp.raise_for_status()
-            data = await resp.json()
+            data = _json_loads(await resp.read())
             
             try:
                 geo_object = data["response"]["GeoObjectCollection"]["featureMember"][0]["GeoObject"]
@@ -325,6 +725,35 @@ class StandaloneDataService:
                 raise ValueError(f"Failed to parse geocoding response: {e}")
     
     async def get_static_map(self, lon: float, lat: float, point: bool = True) -> bytes:
+        """Get static map image, reusing images saved in map_cache_dir.
+        
+        Maps are stored as one PNG file per (lon, lat, zoom, point) and never
+        expire, a map of the same spot does not change in practice. Concurrent
+        calls for the same map share one download.
+        """
+        return await self._map_flight.run(
+            (lon, lat, point), lambda: self._static_map(lon, lat, point)
+        )
+    
+    async def _static_map(self, lon: float, lat: float, point: bool) -> bytes:
+        """Get static map image through the disk cache and Yandex."""
+        key = hashlib.blake2b(
+            f"{lon:.6f},{lat:.6f},{_MAP_ZOOM},map,{point}".encode(), digest_size=16
+        ).hexdigest()
+        path = self.map_cache_dir / f"{key}.png"
+        
+        image = await self._run_io(_read_file, path)
+        if image is not None:
+            return image
+        
+        image = await self._static_map_remote(lon, lat, point)
+        try:
+            await self._run_io(_write_file_atomic, path, image)
+        except OSError as e:
+            logger.warning("Failed to cache static map %s: %s", path, e)
+        return image
+    
+    async def _static_map_remote(self, lon: float, lat: float, point: bool) -> bytes:
         """Get static map image from Yandex.
         
         Note: Static Maps API v1 does NOT require API key in parameters.
@@ -335,7 +764,7 @@ class StandaloneDataService:
         params = {
             "ll": f"{lon},{lat}",
             "size": "400,300",
-            "z": "15",
+            "z": _MAP_ZOOM,
             "l": "map"
         }
         
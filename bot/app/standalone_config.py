@@ -1,13 +1,28 @@
 """Standalone bot configuration - works without backend."""
 
+import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Final
 from dotenv import load_dotenv
 
-# Load .env from project root
-env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(env_path)
+logger = logging.getLogger(__name__)
+
+# Project root, resolved once for the .env file and default data paths
+_ROOT: Final[Path] = Path(__file__).resolve().parents[2]
+env_path = _ROOT / ".env"
+
+
+@lru_cache(maxsize=1)
+def load_env() -> bool:
+    """Load .env from project root into os.environ, only on the first call."""
+    return load_dotenv(env_path)
+
+
+# Field defaults below read os.environ when the class is created
+load_env()
 
 
 @dataclass
@@ -22,9 +37,13 @@ class StandaloneBotConfig:
     
     # GigaChat (optional)
     GIGACHAT_CREDENTIALS: str = os.getenv("GIGACHAT_CREDENTIALS", "")
+    GIGACHAT_MAX_CONCURRENCY: int = int(os.getenv("GIGACHAT_MAX_CONCURRENCY", "16"))
     
     # Database
-    DATABASE_PATH: str = os.getenv("DATABASE_PATH", str(Path(__file__).parent.parent.parent / "medical_data.db"))
+    DATABASE_PATH: str = os.getenv("DATABASE_PATH", str(_ROOT / "medical_data.db"))
+    
+    # Downloaded static map images
+    MAP_CACHE_DIR: str = os.getenv("MAP_CACHE_DIR", str(_ROOT / "map_cache"))
     
     # Pagination
     ITEMS_PER_PAGE: int = 10
@@ -44,11 +63,11 @@ class StandaloneBotConfig:
         
         # Yandex API key is optional for basic functionality
         if not self.YANDEX_API_KEY:
-            print("⚠️  YANDEX_API_KEY not set. Maps functionality will be disabled.")
+            logger.warning("YANDEX_API_KEY not set. Maps functionality will be disabled.")
         
         # GigaChat is optional
         if not self.GIGACHAT_CREDENTIALS:
-            print("⚠️  GIGACHAT_CREDENTIALS not set. AI Assistant will be disabled.")
+            logger.warning("GIGACHAT_CREDENTIALS not set. AI Assistant will be disabled.")
 
 
 config = StandaloneBotConfig()
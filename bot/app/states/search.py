@@ -1,8 +1,7 @@
 """FSM states for doctor search."""
 
 from aiogram.fsm.state import State, StatesGroup
-from dataclasses import dataclass
-from typing import Optional
+from typing import NamedTuple, Optional
 
 
 class SearchStates(StatesGroup):
@@ -14,9 +13,12 @@ class SearchStates(StatesGroup):
     ai_searching = State()  # AI-powered search state
 
 
-@dataclass
-class SearchData:
-    """Data stored during search."""
+class SearchData(NamedTuple):
+    """Data stored during search.
+
+    Immutable and without a per-instance ``__dict__``; use ``_replace()``
+    to get an updated copy.
+    """
 
     specialty_id: Optional[int] = None
     specialty_name: Optional[str] = None
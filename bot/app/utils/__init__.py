@@ -1,5 +1,21 @@
 """Utility functions."""
 
-from .message_utils import safe_edit_markup, safe_message_transition
+from .cache import SingleFlight, TTLCache, cached_call
+from .callback_utils import parse_cb
+from .errors import BACKEND_ERRORS
+from .fsm_utils import set_state_and_data
+from .message_utils import safe_delete, safe_edit_markup, safe_message_transition
+from .ratelimit import send_limiter
 
-__all__ = ["safe_edit_markup", "safe_message_transition"]
+__all__ = [
+    "BACKEND_ERRORS",
+    "SingleFlight",
+    "TTLCache",
+    "cached_call",
+    "parse_cb",
+    "safe_delete",
+    "safe_edit_markup",
+    "safe_message_transition",
+    "send_limiter",
+    "set_state_and_data",
+]
@@ -0,0 +1,146 @@
+"""In-process caching helpers."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller starts the load as a task, later callers await the same
+    task and receive its result or exception. Nothing is kept once the load
+    finished, so the next call after that starts a new one.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Await loader() or join the call already running for key.
+
+        Args:
+            key: Key identifying identical calls
+            loader: Zero-argument coroutine factory producing the value
+
+        Returns:
+            Result of the shared call
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = future
+        # Shield so a cancelled caller does not cancel the load for the others
+        return await asyncio.shield(future)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run loader and release the in-flight slot."""
+        try:
+            return await loader()
+        finally:
+            self._inflight.pop(key, None)
+
+
+class TTLCache:
+    """Dictionary cache whose entries expire after a time-to-live.
+
+    Entries are stored as ``key -> (expiry_ts, value)`` using the monotonic
+    clock. Concurrent misses for the same key share one in-flight load
+    task, so they result in a single upstream call and all receive its
+    result or exception. When ``maxsize`` is set, the oldest entries are
+    evicted first.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: Optional[int] = None):
+        """Initialize cache.
+
+        Args:
+            ttl: Default time-to-live of an entry in seconds
+            maxsize: Optional maximum number of entries
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for a non-expired entry."""
+        entry = self._data.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return True, entry[1]
+        return False, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get cached value or default if missing or expired."""
+        found, value = self._lookup(key)
+        return value if found else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value for key."""
+        expiry = time.monotonic() + (self.ttl if ttl is None else ttl)
+        # Re-insert so dict order reflects recency of writes
+        self._data.pop(key, None)
+        self._data[key] = (expiry, value)
+
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                oldest = next(iter(self._data))
+                del self._data[oldest]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry or, when key is None, the whole cache."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Get cached value or load it with single-flight protection.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument coroutine factory producing the value
+            ttl: Optional time-to-live override for the stored entry
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        async def load() -> Any:
+            value = await loader()
+            self.set(key, value, ttl)
+            return value
+
+        return await self._flight.run(key, load)
+
+
+# Shared cache for backend lookups made from handlers
+_call_cache = TTLCache(ttl=300.0, maxsize=4096)
+
+
+async def cached_call(
+    key: Hashable,
+    coro_factory: Callable[[], Awaitable[Any]],
+    ttl: float = 300.0,
+) -> Any:
+    """Await coro_factory() once per key and TTL window.
+
+    Concurrent callers with the same key share a single upstream call.
+
+    Args:
+        key: Cache key, e.g. ("hosp", specialty_id)
+        coro_factory: Zero-argument coroutine factory producing the value
+        ttl: Time-to-live of the cached value in seconds
+
+    Returns:
+        Cached or freshly loaded value
+    """
+    return await _call_cache.get_or_load(key, coro_factory, ttl=ttl)
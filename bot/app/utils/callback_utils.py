@@ -0,0 +1,19 @@
+"""Callback data helpers."""
+
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=1024)
+def parse_cb(data: str) -> Tuple[int, ...]:
+    """
+    Parse numeric arguments of callback data like "prefix:1:2".
+
+    Args:
+        data: Raw callback data
+
+    Returns:
+        Tuple of integer arguments following the prefix
+    """
+    _, _, args = data.partition(":")
+    return tuple(int(part) for part in args.split(":"))
@@ -0,0 +1,17 @@
+"""Expected error types for handlers."""
+
+import asyncio
+import sqlite3
+
+import aiohttp
+
+# Failures of the data service or external APIs that handlers report to the
+# user themselves. Anything else goes to the dispatcher errors handler.
+# ValueError covers "not found" and parsing errors raised by the data service.
+BACKEND_ERRORS = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    KeyError,
+    ValueError,
+    sqlite3.Error,
+)
@@ -0,0 +1,34 @@
+"""FSM state helpers."""
+
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StateType
+
+
+async def set_state_and_data(
+    state: FSMContext,
+    new_state: StateType,
+    data: Optional[Dict[str, Any]] = None,
+    **updates: Any,
+) -> None:
+    """
+    Update FSM data and switch state with as few storage calls as possible.
+
+    update_data() reads the stored data before writing it back. When the
+    handler already called get_data(), pass that dict as ``data`` and it is
+    merged and written directly, so the step costs two storage calls
+    (set_data + set_state) instead of three.
+
+    Args:
+        state: FSM context
+        new_state: State to switch to
+        data: Data previously returned by state.get_data(), if any
+        **updates: Keys to store
+    """
+    if data is None:
+        await state.update_data(**updates)
+    else:
+        data.update(updates)
+        await state.set_data(data)
+    await state.set_state(new_state)
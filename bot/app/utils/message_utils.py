@@ -1,23 +1,44 @@
 """Message utilities for safe message editing."""
 
-from aiogram.types import Message, InlineKeyboardMarkup, CallbackQuery
+from contextlib import suppress
+
+from aiogram.enums import ContentType
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardMarkup,
+    MaybeInaccessibleMessage,
+    Message,
+)
 from aiogram.exceptions import TelegramBadRequest
 from typing import Optional
 
 
+async def safe_delete(message: MaybeInaccessibleMessage) -> None:
+    """
+    Delete message, ignoring Telegram errors for already deleted or too old messages.
+
+    Args:
+        message: Message object to delete, inaccessible messages are skipped
+    """
+    if not isinstance(message, Message):
+        return
+    with suppress(TelegramBadRequest):
+        await message.delete()
+
+
 async def safe_message_transition(
     callback: CallbackQuery,
     text: str,
     reply_markup: Optional[InlineKeyboardMarkup] = None,
-    parse_mode: Optional[str] = "HTML",
 ) -> Message:
     """
     Universal message transition handler for callbacks.
 
     Handles all types of message transitions:
-    - Text to text (edit)
+    - Text to text (edit in place, one API call; nothing more when unchanged)
     - Photo to text (delete + send)
     - Any media to text (delete + send)
+    - Inaccessible (too old or deleted) message: send only
 
     This is the RECOMMENDED way to handle navigation in callback handlers.
 
@@ -25,23 +46,32 @@ async def safe_message_transition(
         callback: CallbackQuery object
         text: New message text
         reply_markup: Optional inline keyboard
-        parse_mode: Parse mode for the message (default: HTML)
 
     Returns:
         The new or edited message
     """
     message = callback.message
 
-    # Always try to delete and send new for callbacks
-    # This is safer and more predictable
-    try:
-        await message.delete()
-    except Exception:
-        pass
+    # Too old or deleted messages arrive as InaccessibleMessage, which can
+    # only be answered
+    if not isinstance(message, Message):
+        return await message.answer(text=text, reply_markup=reply_markup)
+
+    # Text messages can be edited in place
+    if message.content_type == ContentType.TEXT:
+        try:
+            edited = await message.edit_text(text=text, reply_markup=reply_markup)
+            if isinstance(edited, Message):
+                return edited
+            return message
+        except TelegramBadRequest as e:
+            # Same text and keyboard, e.g. a repeated tap - already shown
+            if "message is not modified" in e.message:
+                return message
+            # Too old or otherwise not editable - fall back to delete + send
 
-    return await message.answer(
-        text=text, reply_markup=reply_markup, parse_mode=parse_mode
-    )
+    await safe_delete(message)
+    return await message.answer(text=text, reply_markup=reply_markup)
 
 
 async def safe_edit_markup(
@@ -0,0 +1,70 @@
+"""Outgoing Telegram request rate limiting."""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+# Telegram allows about 30 messages per second per bot; keep a small margin
+SEND_RATE = 28
+SEND_PERIOD = 1.0
+
+
+class AsyncLimiter:
+    """Token bucket limiter usable as ``async with limiter:``.
+
+    Up to ``max_rate`` acquisitions are allowed per ``time_period`` seconds.
+    Callers over the budget wait in FIFO order instead of being rejected.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """Initialize limiter.
+
+        Args:
+            max_rate: Number of acquisitions allowed per period
+            time_period: Period length in seconds
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+        # Created on the running loop at first use, see _get_lock()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        """Get the lock for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self) -> None:
+        """Add tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_rate,
+            self._tokens + (now - self._last) * self.max_rate / self.time_period,
+        )
+        self._last = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._get_lock():
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep(
+                    (1 - self._tokens) * self.time_period / self.max_rate
+                )
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+send_limiter = AsyncLimiter(SEND_RATE, SEND_PERIOD)
+
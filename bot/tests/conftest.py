@@ -0,0 +1,6 @@
+"""Test configuration: make the ``app`` package importable."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
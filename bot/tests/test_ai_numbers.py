@@ -0,0 +1,56 @@
+"""Tests for parsing hospital numbers out of a streamed AI answer."""
+
+from app.services.ai_assistant import AIAssistant
+
+
+def collect(chunks, count):
+    """Feed chunks like _stream_hospital_numbers() does.
+
+    Returns:
+        Tuple of (collected numbers, number of chunks consumed)
+    """
+    numbers = []
+    text = ""
+    pos = 0
+    for consumed, chunk in enumerate(chunks, 1):
+        text += chunk
+        pos, done = AIAssistant._collect_numbers(text, pos, count, numbers, final=False)
+        if done:
+            return numbers, consumed
+    AIAssistant._collect_numbers(text, pos, count, numbers, final=True)
+    return numbers, len(chunks)
+
+
+def test_words_between_numbers_are_skipped():
+    assert collect(["1, 3 и 5"], 10)[0] == [1, 3, 5]
+    assert collect(["1, 3 ", "и ", "5"], 10)[0] == [1, 3, 5]
+
+
+def test_address_remarks_between_numbers_are_skipped():
+    assert collect(["1 (ул. Ленина), 3"], 10)[0] == [1, 3]
+    assert collect(["1 (ул. Ле", "нина), ", "3"], 10)[0] == [1, 3]
+
+
+def test_number_split_across_chunks():
+    assert collect(["1", "2, 3"], 20)[0] == [12, 3]
+
+
+def test_out_of_range_and_repeated_numbers_are_ignored():
+    assert collect(["0, 2, 2, 11, 4"], 10)[0] == [2, 4]
+
+
+def test_stream_stops_once_every_hospital_is_named():
+    numbers, consumed = collect(["2, 1", ", и всё", " остальное"], 2)
+    assert numbers == [2, 1]
+    assert consumed == 2
+
+
+def test_stream_stops_on_prose_line_after_numbers():
+    numbers, consumed = collect(["1, 3\n", "Эти больницы ", "ближе 5 к центру"], 10)
+    assert numbers == [1, 3]
+    assert consumed == 2
+
+
+def test_leading_prose_does_not_stop_stream():
+    numbers, _ = collect(["Подходят:\n", "4, 7"], 10)
+    assert numbers == [4, 7]
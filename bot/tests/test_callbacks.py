@@ -0,0 +1,40 @@
+"""Tests for the prefix table of the callback dispatcher."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from aiogram.dispatcher.event.bases import SkipHandler
+
+from app.handlers import callbacks, standalone_search
+
+
+def test_table_knows_declared_workflow_data():
+    handler, params = callbacks._PREFIX_TABLE["specialty"]
+    assert handler is standalone_search.select_specialty
+    assert params == {"state", "data_service"}
+
+
+def test_dispatch_passes_only_declared_data(monkeypatch):
+    received = {}
+
+    async def handler(callback, state):
+        received.update(callback=callback, state=state)
+        return "done"
+
+    monkeypatch.setitem(
+        callbacks._PREFIX_TABLE, "test", (handler, callbacks._data_params(handler))
+    )
+    callback = MagicMock(data="test:1")
+
+    result = asyncio.run(
+        callbacks.dispatch_cb(callback, state="fsm", data_service="db", bot="bot")
+    )
+
+    assert result == "done"
+    assert received == {"callback": callback, "state": "fsm"}
+
+
+def test_dispatch_skips_unknown_prefix():
+    with pytest.raises(SkipHandler):
+        asyncio.run(callbacks.dispatch_cb(MagicMock(data="ai_hospital:1")))
@@ -0,0 +1,26 @@
+"""Tests for callback message transitions."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from aiogram.types import Chat, InaccessibleMessage
+
+from app.utils import safe_delete, safe_message_transition
+
+
+def test_transition_from_inaccessible_message_sends_new_message():
+    message = InaccessibleMessage(chat=Chat(id=1, type="private"), message_id=10)
+    callback = MagicMock()
+    callback.message = message
+
+    with patch.object(InaccessibleMessage, "answer", AsyncMock(return_value="sent")) as answer:
+        result = asyncio.run(safe_message_transition(callback, "text"))
+
+    assert result == "sent"
+    answer.assert_awaited_once_with(text="text", reply_markup=None)
+
+
+def test_safe_delete_skips_inaccessible_message():
+    message = InaccessibleMessage(chat=Chat(id=1, type="private"), message_id=10)
+
+    asyncio.run(safe_delete(message))
@@ -0,0 +1,97 @@
+"""Tests for OFFSET and keyset pagination of the data service list queries."""
+
+import asyncio
+
+import pytest
+
+from app.services.standalone_service import StandaloneDataService
+
+# Names repeat, so pages must be ordered and split by (name, id)
+NAMES = ["Б", "А", "Б", "В", "А", "Б", "В"]
+
+
+def seed(path):
+    """Create a database with duplicate names in every listed table."""
+
+    async def scenario():
+        data_service = StandaloneDataService(db_path=str(path))
+        try:
+            await data_service.connect()
+            db = data_service._db
+            await db.execute("INSERT INTO specialties (id, name) VALUES (1, 'Терапевт')")
+            for i, name in enumerate(NAMES, 1):
+                await db.execute("INSERT INTO specialties (id, name) VALUES (?, ?)", (i + 1, name))
+                await db.execute("INSERT INTO hospitals (id, name) VALUES (?, ?)", (i, name))
+                await db.execute("INSERT INTO doctors (id, full_name) VALUES (?, ?)", (i, name))
+                # Every doctor works in hospital 1 and in the hospital with the same id
+                await db.execute(
+                    "INSERT OR IGNORE INTO doctor_work_placements VALUES (?, 1, 1), (?, ?, 1)",
+                    (i, i, i),
+                )
+            await db.commit()
+        finally:
+            await data_service.close()
+
+    asyncio.run(scenario())
+
+
+LISTS = {
+    "specialties": lambda ds, **page: ds.get_specialties(**page),
+    "hospitals": lambda ds, **page: ds.get_hospitals(**page),
+    "hospitals_by_specialty": lambda ds, **page: ds.get_hospitals(1, **page),
+    "doctors": lambda ds, **page: ds.get_doctors(1, 1, **page),
+}
+
+
+@pytest.mark.parametrize("name", sorted(LISTS))
+@pytest.mark.parametrize("limit", [1, 2, 3, 10])
+def test_keyset_pages_match_offset_pages(tmp_path, name, limit):
+    seed(tmp_path / "test.db")
+    get_page = LISTS[name]
+
+    async def scenario():
+        data_service = StandaloneDataService(db_path=str(tmp_path / "test.db"))
+        try:
+            full = await get_page(data_service, limit=100)
+            expected = [item["id"] for item in full["items"]]
+
+            offset_ids, skip = [], 0
+            while True:
+                page = await get_page(data_service, skip=skip, limit=limit)
+                if not page["items"]:
+                    break
+                offset_ids += [item["id"] for item in page["items"]]
+                skip += limit
+
+            keyset_ids, after = [], None
+            while True:
+                page = await get_page(data_service, limit=limit, after=after)
+                keyset_ids += [item["id"] for item in page["items"]]
+                assert page["total"] == full["total"]
+                after = page["next_after"]
+                if after is None:
+                    break
+            return expected, offset_ids, keyset_ids
+        finally:
+            await data_service.close()
+
+    expected, offset_ids, keyset_ids = asyncio.run(scenario())
+
+    assert len(set(expected)) == len(expected)
+    assert offset_ids == expected
+    assert keyset_ids == expected
+
+
+@pytest.mark.parametrize("name", sorted(LISTS))
+def test_skip_with_after_is_rejected(tmp_path, name):
+    seed(tmp_path / "test.db")
+
+    async def scenario():
+        data_service = StandaloneDataService(db_path=str(tmp_path / "test.db"))
+        try:
+            await LISTS[name](data_service, skip=2, limit=2, after=("А", 2))
+        finally:
+            await data_service.close()
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
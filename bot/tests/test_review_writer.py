@@ -0,0 +1,110 @@
+"""Tests for the batched review writer in standalone_review."""
+
+import asyncio
+import sqlite3
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.handlers import standalone_review
+from app.handlers.standalone_review import (
+    ReviewItem,
+    process_review,
+    start_review_flusher,
+    stop_review_flusher,
+    submit_review,
+)
+
+
+class FakeDataService:
+    """Records create_reviews_bulk() calls, optionally failing them."""
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    async def create_reviews_bulk(self, reviews):
+        if self.error is not None:
+            raise self.error
+        self.batches.append(reviews)
+        return len(reviews)
+
+
+def make_item(doctor_id=1):
+    return ReviewItem(
+        doctor_id=doctor_id, hospital_id=1, user_name="user", review_text="good doctor"
+    )
+
+
+def test_concurrent_reviews_are_written_in_one_batch():
+    data_service = FakeDataService()
+
+    async def scenario():
+        start_review_flusher(data_service)
+        try:
+            await asyncio.gather(
+                *(submit_review(data_service, make_item(i)) for i in range(3))
+            )
+        finally:
+            await stop_review_flusher(data_service)
+
+    asyncio.run(scenario())
+
+    assert len(data_service.batches) == 1
+    assert [row["doctor_id"] for row in data_service.batches[0]] == [0, 1, 2]
+
+
+def test_write_failure_reaches_submitter():
+    data_service = FakeDataService(error=sqlite3.OperationalError("database is locked"))
+
+    async def scenario():
+        start_review_flusher(data_service)
+        try:
+            await submit_review(data_service, make_item())
+        finally:
+            await stop_review_flusher(data_service)
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(scenario())
+
+
+def test_stop_writes_queued_reviews():
+    data_service = FakeDataService()
+
+    async def scenario():
+        start_review_flusher(data_service)
+        pending = asyncio.ensure_future(submit_review(data_service, make_item()))
+        await asyncio.sleep(0)
+        await stop_review_flusher(data_service)
+        await pending
+
+    asyncio.run(scenario())
+
+    assert len(data_service.batches) == 1
+    assert standalone_review._review_queue is None
+
+
+def test_process_review_reports_write_failure():
+    data_service = FakeDataService(error=sqlite3.OperationalError("disk I/O error"))
+    message = MagicMock()
+    message.text = "Very attentive doctor, explained everything."
+    message.from_user.full_name = "User"
+    message.answer = AsyncMock()
+    state = MagicMock()
+    state.get_data = AsyncMock(return_value={"doctor_id": 5, "hospital_id": 7})
+    state.clear = AsyncMock()
+    state.set_state = AsyncMock()
+
+    async def scenario():
+        start_review_flusher(data_service)
+        try:
+            await process_review(message, state, data_service)
+        finally:
+            await stop_review_flusher(data_service)
+
+    asyncio.run(scenario())
+
+    message.answer.assert_awaited_once()
+    assert "Ошибка" in message.answer.await_args.args[0]
+    state.clear.assert_awaited_once()
+    state.set_state.assert_not_awaited()